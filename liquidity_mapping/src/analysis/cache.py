@@ -0,0 +1,178 @@
+"""On-disk cache for analysis results (Parquet + JSON)."""
+
+import json
+import os
+import shutil
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from src.analysis.calculator import AnalysisResult, ExchangeAnalysis, TimeframeDelta
+
+try:
+    import pyarrow  # noqa: F401
+except ImportError:  # pyarrow is optional (pip install -e ".[cache]")
+    pyarrow = None
+
+CACHE_DIR_NAME = "liquidity_mapping"
+# Files of a cached analysis: scalars and deltas as JSON, input frames as Parquet
+_ANALYSIS_FILE = "analysis.json"
+_ANALYSIS_FRAMES = ("raw_klines", "raw_oi", "raw_funding")
+
+
+def default_cache_dir() -> Path:
+    """User cache directory: $XDG_CACHE_HOME/liquidity_mapping, else ~/.cache/liquidity_mapping."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / CACHE_DIR_NAME
+
+
+def _cache_dir(cache_dir: Path | None) -> Path:
+    """Resolve the cache directory (defaults to default_cache_dir())."""
+    return cache_dir if cache_dir is not None else default_cache_dir()
+
+
+def analysis_cache_path(
+    symbol: str,
+    start_time: datetime,
+    end_time: datetime,
+    latest_open_time: datetime,
+    cache_dir: Path | None = None,
+) -> Path:
+    """Build the cache entry path for an analysis run.
+
+    The latest stored open_time is part of the key, so newly fetched candles
+    produce a new entry rather than a stale hit.
+
+    Args:
+        symbol: Trading pair symbol
+        start_time: Analysis start time
+        end_time: Analysis end time
+        latest_open_time: Latest open_time stored for the symbol
+        cache_dir: Cache directory (defaults to default_cache_dir())
+
+    Returns:
+        Path of the directory holding this analysis
+    """
+    fmt = "%Y%m%d%H%M%S"
+    name = (
+        f"{symbol}_analysis_{start_time.strftime(fmt)}_{end_time.strftime(fmt)}"
+        f"_{latest_open_time.strftime(fmt)}"
+    )
+    return _cache_dir(cache_dir) / name
+
+
+def read_cached_analysis(path: Path) -> AnalysisResult | None:
+    """Read a cached analysis result.
+
+    Args:
+        path: Path from analysis_cache_path
+
+    Returns:
+        Cached AnalysisResult, or None on a miss, an unreadable entry or when
+        pyarrow is not installed
+    """
+    if pyarrow is None:
+        return None
+    try:
+        meta = json.loads((path / _ANALYSIS_FILE).read_text())
+        frames = {
+            name: pd.read_parquet(path / f"{name}.parquet", engine="pyarrow")
+            for name in meta["frames"]
+        }
+        return AnalysisResult(
+            symbol=meta["symbol"],
+            start_time=datetime.fromisoformat(meta["start_time"]),
+            end_time=datetime.fromisoformat(meta["end_time"]),
+            exchange_analyses=[
+                ExchangeAnalysis(
+                    exchange=analysis["exchange"],
+                    market_type=analysis["market_type"],
+                    timeframe_deltas=[
+                        TimeframeDelta(**delta) for delta in analysis["timeframe_deltas"]
+                    ],
+                )
+                for analysis in meta["exchange_analyses"]
+            ],
+            raw_klines=frames["raw_klines"],
+            raw_oi=frames.get("raw_oi"),
+            raw_funding=frames.get("raw_funding"),
+        )
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError):
+        # Partly written, or written by an incompatible version of the code
+        return None
+
+
+def write_cached_analysis(result: AnalysisResult, path: Path) -> None:
+    """Write an analysis result, including its input frames, to the cache.
+
+    The entry is built in a temporary directory and renamed into place, so
+    readers never see a partial one. No-op when pyarrow is not installed.
+
+    Args:
+        result: Result of calculate_deltas
+        path: Path from analysis_cache_path
+    """
+    if pyarrow is None or path.exists():
+        return
+    frames = {
+        name: getattr(result, name)
+        for name in _ANALYSIS_FRAMES
+        if getattr(result, name) is not None
+    }
+    meta = {
+        "symbol": result.symbol,
+        "start_time": result.start_time.isoformat(),
+        "end_time": result.end_time.isoformat(),
+        "exchange_analyses": [asdict(analysis) for analysis in result.exchange_analyses],
+        "frames": list(frames),
+    }
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    tmp_path.mkdir(parents=True)
+    # Plain json keeps NaN deltas as NaN; numpy floats are float subclasses
+    (tmp_path / _ANALYSIS_FILE).write_text(json.dumps(meta))
+    for name, df in frames.items():
+        write_cached_frame(df, tmp_path / f"{name}.parquet")
+    try:
+        os.replace(tmp_path, path)
+    except OSError:
+        # Another run cached the same analysis first
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def write_cached_frame(df: pd.DataFrame, path: Path) -> None:
+    """Write a DataFrame to the cache. No-op when pyarrow is not installed.
+
+    Args:
+        df: DataFrame to cache
+        path: Parquet file path
+    """
+    if pyarrow is None:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(path, engine="pyarrow", compression="zstd", index=False)
+
+
+def clear_symbol_cache(symbol: str, cache_dir: Path | None = None) -> None:
+    """Delete every cached file for a symbol.
+
+    Called after new data is written for the symbol, since an upsert can
+    change existing candles, OI or funding without moving the latest open_time.
+
+    Args:
+        symbol: Trading pair symbol
+        cache_dir: Cache directory (defaults to default_cache_dir())
+    """
+    directory = _cache_dir(cache_dir)
+    if not directory.exists():
+        return
+    for path in directory.glob(f"{symbol}_*"):
+        if path.is_dir():
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            path.unlink(missing_ok=True)
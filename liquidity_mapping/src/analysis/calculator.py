@@ -1,12 +1,32 @@
 """Delta calculations for price, volume, and OI across timeframes."""
 
+import re
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import datetime
+from functools import lru_cache
+from operator import attrgetter
 
+import numpy as np
 import pandas as pd
 
 from src.db.models import FundingRateModel, KlineModel, OpenInterestModel
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional (pip install -e ".[fast]")
+    njit = None
+
+# Timeframe strings: a count and a unit (hours, days, weeks), e.g. 4h, 1d, 1w
+_TF_RE = re.compile(r"(\d+)([hdw])")
+_TF_UNIT_NS = {
+    "h": 3_600_000_000_000,
+    "d": 86_400_000_000_000,
+    "w": 604_800_000_000_000,
+}
+
+# Price/volume columns handed to _calculate_timeframe_delta as numpy arrays
+_KLINE_ARRAY_COLUMNS = ("open", "close", "volume")
+
 
 @dataclass
 class TimeframeDelta:
@@ -42,27 +62,30 @@ class AnalysisResult:
     end_time: datetime
     exchange_analyses: list[ExchangeAnalysis]
     raw_klines: pd.DataFrame
-    raw_oi: pd.DataFrame
+    raw_oi: pd.DataFrame | None
     raw_funding: pd.DataFrame | None = None
 
 
 def calculate_deltas(
-    klines: list[KlineModel],
+    klines: list[KlineModel] | pd.DataFrame,
     oi_data: list[OpenInterestModel],
     start_time: datetime,
     end_time: datetime,
     timeframes: list[str] | None = None,
     funding_data: list[FundingRateModel] | None = None,
+    symbol: str | None = None,
 ) -> AnalysisResult:
     """Calculate delta metrics across timeframes.
 
     Args:
-        klines: List of kline data from database
+        klines: List of kline data from database, or a kline DataFrame with
+            the same columns (e.g. from kline_columns_to_df)
         oi_data: List of OI data from database
         start_time: Analysis start time
         end_time: Analysis end time
-        timeframes: Timeframes to calculate (default: 1h, 4h, 12h, 24h)
+        timeframes: Timeframes to calculate, e.g. 6h, 1d, 1w (default: 1h, 4h, 12h, 24h)
         funding_data: List of funding rate data from database
+        symbol: Symbol for the result (default: taken from the kline data)
 
     Returns:
         AnalysisResult with all calculations
@@ -71,54 +94,51 @@ def calculate_deltas(
         timeframes = ["1h", "4h", "12h", "24h"]
 
     # Convert to DataFrames
-    kline_df = pd.DataFrame([
-        {
-            "exchange": k.exchange,
-            "market_type": k.market_type,
-            "open_time": k.open_time,
-            "open": k.open,
-            "high": k.high,
-            "low": k.low,
-            "close": k.close,
-            "volume": k.volume,
-            "quote_volume": k.quote_volume,
-        }
-        for k in klines
-    ]) if klines else pd.DataFrame()
-
-    oi_df = pd.DataFrame([
-        {
-            "exchange": o.exchange,
-            "timestamp": o.timestamp,
-            "open_interest": o.open_interest,
-            "open_interest_value": o.open_interest_value,
-        }
-        for o in oi_data
-    ]) if oi_data else pd.DataFrame()
-
-    funding_df = pd.DataFrame([
-        {
-            "exchange": f.exchange,
-            "funding_time": f.funding_time,
-            "funding_rate": f.funding_rate,
-        }
-        for f in funding_data
-    ]) if funding_data else None
+    if isinstance(klines, pd.DataFrame):
+        kline_df = klines
+        if symbol is None:
+            symbol = str(klines["symbol"].iat[0]) if "symbol" in klines and len(klines) else ""
+    else:
+        kline_df = klines_to_df(klines) if klines else pd.DataFrame()
+        if symbol is None:
+            # Get symbol from first kline
+            symbol = klines[0].symbol if klines else ""
+    oi_df = oi_to_df(oi_data) if oi_data else None
+    funding_df = funding_to_df(funding_data) if funding_data else None
 
     exchange_analyses = []
 
     if not kline_df.empty:
+        # Sort once up front; groupby keeps this row order within each group
+        kline_df = kline_df.sort_values("open_time", kind="stable")
+
+        # Timeframe windows as int64 ns bounds, shared by every group
+        start_ns = _to_ns(start_time)
+        end_ns = _to_ns(end_time)
+        windows = [(tf, max(end_ns - _parse_timeframe(tf), start_ns)) for tf in timeframes]
+
+        # Split OI into per-exchange (timestamp, open_interest) arrays once
+        oi_groups: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        if oi_df is not None:
+            sorted_oi = oi_df.sort_values(["exchange", "timestamp"], kind="stable")
+            timestamps = _ns_keys(sorted_oi["timestamp"])
+            open_interest = sorted_oi["open_interest"].to_numpy()
+            for ex, idx in sorted_oi.groupby("exchange", sort=False).indices.items():
+                oi_groups[ex] = (timestamps[idx], open_interest[idx])
+
         # Group by exchange and market type
         for (exchange, market_type), group in kline_df.groupby(["exchange", "market_type"]):
-            group = group.sort_values("open_time")
-
-            # Get OI for this exchange
-            exchange_oi = oi_df[oi_df["exchange"] == exchange] if not oi_df.empty else pd.DataFrame()
+            kline_arrays = {col: group[col].to_numpy() for col in _KLINE_ARRAY_COLUMNS}
+            kline_arrays["open_time"] = _ns_keys(group["open_time"])
+            # high + low + close, summed in place once and shared by every timeframe
+            hlc = np.add(group["high"].to_numpy(), group["low"].to_numpy())
+            kline_arrays["hlc"] = np.add(hlc, group["close"].to_numpy(), out=hlc)
+            exchange_oi = oi_groups.get(exchange)
 
             timeframe_deltas = []
-            for tf in timeframes:
+            for tf, tf_start_ns in windows:
                 delta = _calculate_timeframe_delta(
-                    group, exchange_oi, tf, start_time, end_time
+                    kline_arrays, exchange_oi, tf, tf_start_ns, end_ns
                 )
                 if delta:
                     timeframe_deltas.append(delta)
@@ -130,9 +150,6 @@ def calculate_deltas(
                     timeframe_deltas=timeframe_deltas,
                 ))
 
-    # Get symbol from first kline
-    symbol = klines[0].symbol if klines else ""
-
     return AnalysisResult(
         symbol=symbol,
         start_time=start_time,
@@ -144,64 +161,159 @@ def calculate_deltas(
     )
 
 
+def _column(rows: list, attr: str, dtype: str) -> np.ndarray:
+    """Extract one attribute from a list of rows into a typed numpy array.
+
+    Args:
+        rows: List of ORM rows
+        attr: Attribute name to extract
+        dtype: Numpy dtype of the resulting array
+
+    Returns:
+        Array of length len(rows)
+    """
+    getter = attrgetter(attr)
+    return np.fromiter((getter(r) for r in rows), dtype=dtype, count=len(rows))
+
+
+def _time_column(rows: list, attr: str) -> np.ndarray:
+    """Extract an epoch-ms attribute from a list of rows as datetime64[ns].
+
+    Args:
+        rows: List of ORM rows
+        attr: Attribute name holding epoch milliseconds
+
+    Returns:
+        Array of naive UTC datetime64[ns] values
+    """
+    return _column(rows, attr, "i8").view("datetime64[ms]").astype("datetime64[ns]")
+
+
+def klines_to_df(klines: list[KlineModel]) -> pd.DataFrame:
+    """Build a kline DataFrame column-wise from ORM rows.
+
+    Args:
+        klines: Non-empty list of kline data from database
+
+    Returns:
+        DataFrame with one typed column per kline field
+    """
+    return pd.DataFrame({
+        "exchange": [k.exchange for k in klines],
+        "market_type": [k.market_type for k in klines],
+        "open_time": _time_column(klines, "open_time"),
+        "open": _column(klines, "open", "f8"),
+        "high": _column(klines, "high", "f8"),
+        "low": _column(klines, "low", "f8"),
+        "close": _column(klines, "close", "f8"),
+        "volume": _column(klines, "volume", "f8"),
+        "quote_volume": _column(klines, "quote_volume", "f8"),
+    }, copy=False)
+
+
+def kline_columns_to_df(columns: dict[str, np.ndarray]) -> pd.DataFrame:
+    """Build a kline DataFrame from Repository.get_kline_columns arrays.
+
+    Args:
+        columns: Column arrays with open_time in epoch milliseconds
+
+    Returns:
+        DataFrame with the same columns as klines_to_df
+    """
+    return pd.DataFrame({
+        **columns,
+        "open_time": columns["open_time"].view("datetime64[ms]").astype("datetime64[ns]"),
+    }, copy=False)
+
+
+def oi_to_df(oi_data: list[OpenInterestModel]) -> pd.DataFrame:
+    """Build an OI DataFrame column-wise from ORM rows.
+
+    Args:
+        oi_data: Non-empty list of OI data from database
+
+    Returns:
+        DataFrame with exchange, timestamp, open_interest, open_interest_value
+    """
+    return pd.DataFrame({
+        "exchange": [o.exchange for o in oi_data],
+        "timestamp": _time_column(oi_data, "timestamp"),
+        "open_interest": _column(oi_data, "open_interest", "f8"),
+        "open_interest_value": _column(oi_data, "open_interest_value", "f8"),
+    }, copy=False)
+
+
+def funding_to_df(funding_data: list[FundingRateModel]) -> pd.DataFrame:
+    """Build a funding rate DataFrame column-wise from ORM rows.
+
+    Args:
+        funding_data: Non-empty list of funding rate data from database
+
+    Returns:
+        DataFrame with exchange, funding_time, funding_rate
+    """
+    return pd.DataFrame({
+        "exchange": [f.exchange for f in funding_data],
+        "funding_time": _time_column(funding_data, "funding_time"),
+        "funding_rate": _column(funding_data, "funding_rate", "f8"),
+    }, copy=False)
+
+
 def _calculate_timeframe_delta(
-    kline_df: pd.DataFrame,
-    oi_df: pd.DataFrame,
+    kline_arrays: dict[str, np.ndarray],
+    oi_arrays: tuple[np.ndarray, np.ndarray] | None,
     timeframe: str,
-    start_time: datetime,
-    end_time: datetime,
+    tf_start_ns: int,
+    end_ns: int,
 ) -> TimeframeDelta | None:
     """Calculate delta for a single timeframe.
 
     Args:
-        kline_df: Kline DataFrame for one exchange/market
-        oi_df: OI DataFrame for one exchange
+        kline_arrays: Kline column arrays for one exchange/market, sorted by
+            open_time (int64 ns)
+        oi_arrays: (timestamp int64 ns, open_interest) arrays for one exchange,
+            sorted by timestamp, or None if the exchange has no OI
         timeframe: Timeframe string (1h, 4h, 12h, 24h)
-        start_time: Analysis start
-        end_time: Analysis end
+        tf_start_ns: Window start (timeframe back from end, clipped to analysis
+            start) as int64 nanoseconds
+        end_ns: Analysis end as int64 nanoseconds
 
     Returns:
         TimeframeDelta or None if insufficient data
     """
-    # Parse timeframe to hours
-    hours = _parse_timeframe(timeframe)
-    tf_duration = timedelta(hours=hours)
-
-    # Filter to timeframe window from end
-    tf_start = end_time - tf_duration
-    if tf_start < start_time:
-        tf_start = start_time
-
-    mask = (kline_df["open_time"] >= tf_start) & (kline_df["open_time"] <= end_time)
-    tf_klines = kline_df[mask].sort_values("open_time")
+    # Locate the window in the sorted open times
+    open_times = kline_arrays["open_time"]
+    lo = np.searchsorted(open_times, tf_start_ns, side="left")
+    hi = np.searchsorted(open_times, end_ns, side="right")
 
-    if tf_klines.empty:
+    if lo >= hi:
         return None
 
     # Price delta
-    price_start = tf_klines.iloc[0]["open"]
-    price_end = tf_klines.iloc[-1]["close"]
+    price_start = kline_arrays["open"][lo]
+    price_end = kline_arrays["close"][hi - 1]
     price_delta = price_end - price_start
     price_delta_pct = (price_delta / price_start * 100) if price_start != 0 else 0
 
-    # Volume total
-    volume_total = tf_klines["volume"].sum()
-
-    # VWAP
-    typical_price = (tf_klines["high"] + tf_klines["low"] + tf_klines["close"]) / 3
-    vwap = (typical_price * tf_klines["volume"]).sum() / volume_total if volume_total > 0 else 0
+    # Volume total and VWAP
+    volume_total, tp_volume_total = _window_sums(
+        kline_arrays["hlc"][lo:hi],
+        kline_arrays["volume"][lo:hi],
+    )
+    vwap = tp_volume_total / volume_total if volume_total > 0 else 0
 
     # OI delta
     oi_start = None
     oi_end = None
     oi_delta = None
 
-    if not oi_df.empty:
-        oi_mask = (oi_df["timestamp"] >= tf_start) & (oi_df["timestamp"] <= end_time)
-        tf_oi = oi_df[oi_mask].sort_values("timestamp")
-        if not tf_oi.empty:
-            oi_start = tf_oi.iloc[0]["open_interest"]
-            oi_end = tf_oi.iloc[-1]["open_interest"]
+    if oi_arrays is not None:
+        timestamps, open_interest = oi_arrays
+        oi_lo = np.searchsorted(timestamps, tf_start_ns, side="left")
+        oi_hi = np.searchsorted(timestamps, end_ns, side="right")
+        if oi_lo < oi_hi:
+            oi_start = open_interest[oi_lo]
+            oi_end = open_interest[oi_hi - 1]
             oi_delta = oi_end - oi_start
 
     return TimeframeDelta(
@@ -218,22 +330,59 @@ def _calculate_timeframe_delta(
     )
 
 
+def _to_ns(dt: datetime) -> int:
+    """Convert a datetime to an int64 nanosecond key."""
+    return pd.Timestamp(dt).value
+
+
+def _ns_keys(times: pd.Series) -> np.ndarray:
+    """Convert a datetime column to int64 nanosecond keys."""
+    return times.to_numpy(dtype="datetime64[ns]").view("int64")
+
+
+def _window_sums_numpy(hlc: np.ndarray, volume: np.ndarray) -> tuple[float, float]:
+    """Sum volume and typical price * volume over a kline window.
+
+    Args:
+        hlc: high + low + close for the window (typical price * 3)
+        volume: Volumes for the window
+
+    Returns:
+        Tuple of (volume_total, tp_volume_total)
+    """
+    return float(volume.sum()), float(np.dot(hlc, volume)) / 3
+
+
+def _window_sums_loop(hlc: np.ndarray, volume: np.ndarray) -> tuple[float, float]:
+    """Single-pass loop form of _window_sums_numpy, compiled with numba."""
+    volume_total = 0.0
+    hlc_volume_total = 0.0
+    for i in range(volume.shape[0]):
+        volume_total += volume[i]
+        hlc_volume_total += hlc[i] * volume[i]
+    return volume_total, hlc_volume_total / 3
+
+
+_window_sums = njit(cache=True)(_window_sums_loop) if njit is not None else _window_sums_numpy
+
+
+@lru_cache(maxsize=None)
 def _parse_timeframe(tf: str) -> int:
-    """Parse timeframe string to hours.
+    """Parse timeframe string to nanoseconds.
 
     Args:
-        tf: Timeframe string (1h, 4h, 12h, 24h)
+        tf: Timeframe string (e.g. 1h, 4h, 12h, 24h, 1d, 1w)
 
     Returns:
-        Number of hours
+        Timeframe duration in nanoseconds
+
+    Raises:
+        ValueError: If the timeframe string is not understood
     """
-    mapping = {
-        "1h": 1,
-        "4h": 4,
-        "12h": 12,
-        "24h": 24,
-    }
-    return mapping.get(tf, 1)
+    match = _TF_RE.fullmatch(tf)
+    if match is None:
+        raise ValueError(f"Unsupported timeframe: {tf!r}")
+    return int(match.group(1)) * _TF_UNIT_NS[match.group(2)]
 
 
 def calculate_aggregated_deltas(
@@ -256,44 +405,55 @@ def calculate_aggregated_deltas(
     if not matching:
         return None
 
-    timeframes = ["1h", "4h", "12h", "24h"]
-    aggregated = []
-
-    for tf in timeframes:
-        # Collect deltas for this timeframe from all exchanges
-        tf_deltas = []
-        for ea in matching:
-            for d in ea.timeframe_deltas:
-                if d.timeframe == tf:
-                    tf_deltas.append(d)
-
-        if not tf_deltas:
-            continue
-
-        # Volume-weighted price delta
-        total_vol = sum(d.volume_total for d in tf_deltas)
-        if total_vol > 0:
-            weighted_price_pct = sum(d.price_delta_pct * d.volume_total for d in tf_deltas) / total_vol
-            weighted_vwap = sum(d.vwap * d.volume_total for d in tf_deltas) / total_vol
-        else:
-            weighted_price_pct = sum(d.price_delta_pct for d in tf_deltas) / len(tf_deltas)
-            weighted_vwap = sum(d.vwap for d in tf_deltas) / len(tf_deltas)
-
-        # Sum OI deltas
-        oi_deltas = [d.oi_delta for d in tf_deltas if d.oi_delta is not None]
-        total_oi_delta = sum(oi_deltas) if oi_deltas else None
-
-        aggregated.append(TimeframeDelta(
+    # Flatten every exchange's deltas into one frame
+    df = pd.DataFrame(
+        [
+            (d.timeframe, d.price_delta_pct, d.vwap, d.volume_total, d.oi_delta)
+            for ea in matching
+            for d in ea.timeframe_deltas
+        ],
+        columns=["timeframe", "price_delta_pct", "vwap", "volume_total", "oi_delta"],
+    )
+    df["oi_delta"] = df["oi_delta"].astype(float)
+    df["price_pct_volume"] = df["price_delta_pct"] * df["volume_total"]
+    df["vwap_volume"] = df["vwap"] * df["volume_total"]
+
+    sums = df.groupby("timeframe").agg(
+        volume_total=("volume_total", "sum"),
+        price_pct_volume=("price_pct_volume", "sum"),
+        vwap_volume=("vwap_volume", "sum"),
+        mean_price_pct=("price_delta_pct", "mean"),
+        mean_vwap=("vwap", "mean"),
+        oi_delta=("oi_delta", "sum"),
+        oi_count=("oi_delta", "count"),
+    )
+    # Order timeframes from shortest to longest
+    sums = sums.reindex(sorted(sums.index, key=_parse_timeframe))
+
+    # Volume-weighted price delta, falling back to a plain mean with no volume
+    has_volume = sums["volume_total"] > 0
+    weighted_price_pct = (sums["price_pct_volume"] / sums["volume_total"]).where(
+        has_volume, sums["mean_price_pct"]
+    )
+    weighted_vwap = (sums["vwap_volume"] / sums["volume_total"]).where(
+        has_volume, sums["mean_vwap"]
+    )
+
+    aggregated = [
+        TimeframeDelta(
             timeframe=tf,
             price_start=0,  # Not meaningful for aggregate
             price_end=0,
             price_delta=0,
-            price_delta_pct=weighted_price_pct,
-            volume_total=total_vol,
+            price_delta_pct=float(weighted_price_pct[tf]),
+            volume_total=float(sums.at[tf, "volume_total"]),
             oi_start=None,
             oi_end=None,
-            oi_delta=total_oi_delta,
-            vwap=weighted_vwap,
-        ))
+            # Sum OI deltas, None if no exchange reported OI
+            oi_delta=float(sums.at[tf, "oi_delta"]) if sums.at[tf, "oi_count"] else None,
+            vwap=float(weighted_vwap[tf]),
+        )
+        for tf in sums.index
+    ]
 
     return aggregated if aggregated else None
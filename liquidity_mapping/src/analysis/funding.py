@@ -2,54 +2,60 @@
 
 import pandas as pd
 
+from src.analysis.calculator import funding_to_df
 from src.db.models import FundingRateModel
 
+# Funding rate -> annualized percentage: 3 fundings/day * 365 days * 100
+ANNUALIZATION_FACTOR = 3 * 365 * 100.0
+
+
+def _to_funding_df(funding_rates: list[FundingRateModel] | pd.DataFrame) -> pd.DataFrame:
+    """Return funding rates as a DataFrame sorted by funding_time.
+
+    Args:
+        funding_rates: List of funding rate data, or a DataFrame already built
+            from it (e.g. AnalysisResult.raw_funding)
+
+    Returns:
+        DataFrame with exchange, funding_time, funding_rate columns
+    """
+    if not isinstance(funding_rates, pd.DataFrame):
+        funding_rates = funding_to_df(funding_rates)
+    return funding_rates.sort_values("funding_time")
+
 
 def calculate_rolling_avg_funding(
-    funding_rates: list[FundingRateModel],
+    funding_rates: list[FundingRateModel] | pd.DataFrame,
     window_periods: int = 3,
 ) -> pd.DataFrame:
     """Calculate rolling average funding rate over N funding periods.
 
     Args:
-        funding_rates: List of funding rate data from database
+        funding_rates: List of funding rate data from database, or its DataFrame
         window_periods: Number of funding periods for rolling average (default 3 = 24h)
 
     Returns:
         DataFrame with funding_time, rolling_avg_rate, and annualized_rate columns
     """
-    if not funding_rates:
+    if funding_rates is None or len(funding_rates) == 0:
         return pd.DataFrame(columns=["funding_time", "rolling_avg_rate", "annualized_rate"])
 
-    df = pd.DataFrame([
-        {
-            "exchange": fr.exchange,
-            "funding_time": fr.funding_time,
-            "funding_rate": fr.funding_rate,
-        }
-        for fr in funding_rates
-    ]).sort_values("funding_time")
+    df = _to_funding_df(funding_rates)
 
     if df.empty:
         return pd.DataFrame(columns=["funding_time", "rolling_avg_rate", "annualized_rate"])
 
-    # Calculate rolling average across all exchanges per timestamp
-    # First, pivot to get funding rate per exchange at each timestamp
-    pivot_df = df.pivot_table(
-        index="funding_time",
-        columns="exchange",
-        values="funding_rate",
-        aggfunc="mean",
-    )
+    # Average across exchanges for each timestamp (one row per exchange per
+    # timestamp, so a flat mean equals the mean of per-exchange rates)
+    avg_rate = df.groupby("funding_time", sort=True)["funding_rate"].mean()
 
-    # Average across exchanges for each timestamp
-    avg_rate = pivot_df.mean(axis=1)
+    # Apply rolling average (a 1-period window is the series itself)
+    if window_periods > 1:
+        rolling_avg = avg_rate.rolling(window=window_periods, min_periods=1).mean()
+    else:
+        rolling_avg = avg_rate
 
-    # Apply rolling average
-    rolling_avg = avg_rate.rolling(window=window_periods, min_periods=1).mean()
-
-    # Calculate annualized rate: rate * 3 (per day) * 365 (per year) * 100 (percentage)
-    annualized = rolling_avg * 3 * 365 * 100
+    annualized = rolling_avg * ANNUALIZATION_FACTOR
 
     result = pd.DataFrame({
         "funding_time": rolling_avg.index,
@@ -61,60 +67,43 @@ def calculate_rolling_avg_funding(
 
 
 def get_latest_funding_stats(
-    funding_rates: list[FundingRateModel],
+    funding_rates: list[FundingRateModel] | pd.DataFrame,
     window_periods: int = 3,
 ) -> dict:
     """Get funding statistics averaged across the entire date range.
 
     Args:
-        funding_rates: List of funding rate data
+        funding_rates: List of funding rate data, or its DataFrame
         window_periods: Window for rolling average (unused, kept for compatibility)
 
     Returns:
         Dict with avg_rate, annualized_rate, and per-exchange rates
     """
-    if not funding_rates:
+    if funding_rates is None or len(funding_rates) == 0:
         return {
             "avg_rate": None,
             "annualized_rate": None,
             "per_exchange": {},
         }
 
-    df = pd.DataFrame([
-        {
-            "exchange": fr.exchange,
-            "funding_time": fr.funding_time,
-            "funding_rate": fr.funding_rate,
+    df = _to_funding_df(funding_rates)
+
+    # Get latest rate per exchange (df is sorted by funding_time)
+    latest_df = df.drop_duplicates("exchange", keep="last")
+    latest_per_exchange = {
+        row.exchange: {
+            "rate": row.funding_rate,
+            "time": row.funding_time,
         }
-        for fr in funding_rates
-    ]).sort_values("funding_time")
-
-    # Get latest rate per exchange
-    latest_per_exchange = {}
-    for exchange in df["exchange"].unique():
-        exchange_df = df[df["exchange"] == exchange]
-        if not exchange_df.empty:
-            latest = exchange_df.iloc[-1]
-            latest_per_exchange[exchange] = {
-                "rate": latest["funding_rate"],
-                "time": latest["funding_time"],
-            }
+        for row in latest_df.itertuples(index=False)
+    }
 
     # Calculate average across entire range
     # First average across exchanges per timestamp, then average all timestamps
-    pivot_df = df.pivot_table(
-        index="funding_time",
-        columns="exchange",
-        values="funding_rate",
-        aggfunc="mean",
-    )
-
-    # Average across exchanges for each timestamp, then average all timestamps
-    avg_rate_per_timestamp = pivot_df.mean(axis=1)
+    avg_rate_per_timestamp = df.groupby("funding_time", sort=True)["funding_rate"].mean()
     overall_avg_rate = avg_rate_per_timestamp.mean()
 
-    # Annualized: rate * 3 (per day) * 365 (per year) * 100 (percentage)
-    annualized_rate = overall_avg_rate * 3 * 365 * 100
+    annualized_rate = overall_avg_rate * ANNUALIZATION_FACTOR
 
     return {
         "avg_rate": overall_avg_rate,
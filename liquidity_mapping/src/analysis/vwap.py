@@ -1,5 +1,6 @@
 """VWAP calculation utilities."""
 
+import numpy as np
 import pandas as pd
 
 from src.db.models import KlineModel
@@ -20,21 +21,22 @@ def calculate_vwap(klines: list[KlineModel]) -> float:
     if not klines:
         return 0.0
 
-    df = pd.DataFrame([
-        {
-            "high": k.high,
-            "low": k.low,
-            "close": k.close,
-            "volume": k.volume,
-        }
-        for k in klines
-    ])
-
-    if df.empty or df["volume"].sum() == 0:
+    n = len(klines)
+    high = np.empty(n)
+    low = np.empty(n)
+    close = np.empty(n)
+    volume = np.empty(n)
+    for i, k in enumerate(klines):
+        high[i] = k.high
+        low[i] = k.low
+        close[i] = k.close
+        volume[i] = k.volume
+
+    total_volume = volume.sum()
+    if total_volume == 0:
         return 0.0
 
-    typical_price = (df["high"] + df["low"] + df["close"]) / 3
-    return float((typical_price * df["volume"]).sum() / df["volume"].sum())
+    return float(np.dot(high + low + close, volume) / (3 * total_volume))
 
 
 def calculate_rolling_vwap(
@@ -55,7 +57,7 @@ def calculate_rolling_vwap(
 
     df = pd.DataFrame([
         {
-            "open_time": k.open_time,
+            "open_time": k.open_time_dt,
             "high": k.high,
             "low": k.low,
             "close": k.close,
@@ -67,13 +69,19 @@ def calculate_rolling_vwap(
     if df.empty:
         return pd.DataFrame(columns=["open_time", "rolling_vwap"])
 
-    # Calculate typical price
-    df["typical_price"] = (df["high"] + df["low"] + df["close"]) / 3
-    df["tp_volume"] = df["typical_price"] * df["volume"]
-
-    # Rolling sum (assuming hourly data, window = window_hours candles)
-    df["rolling_tp_vol"] = df["tp_volume"].rolling(window=window_hours, min_periods=1).sum()
-    df["rolling_vol"] = df["volume"].rolling(window=window_hours, min_periods=1).sum()
-    df["rolling_vwap"] = df["rolling_tp_vol"] / df["rolling_vol"]
-
-    return df[["open_time", "rolling_vwap"]].copy()
+    # Windowed sums via convolution with a ones kernel (assuming hourly data,
+    # window = window_hours candles); the leading partial windows match
+    # rolling(min_periods=1)
+    volume = df["volume"].to_numpy()
+    tp_volume = (df["high"].to_numpy() + df["low"].to_numpy() + df["close"].to_numpy()) / 3 * volume
+    kernel = np.ones(window_hours)
+    n = len(df)
+    rolling_tp_vol = np.convolve(tp_volume, kernel)[:n]
+    rolling_vol = np.convolve(volume, kernel)[:n]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rolling_vwap = rolling_tp_vol / rolling_vol
+
+    return pd.DataFrame({
+        "open_time": df["open_time"].to_numpy(),
+        "rolling_vwap": rolling_vwap,
+    })
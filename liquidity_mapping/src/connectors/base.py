@@ -2,9 +2,14 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
-from typing import AsyncIterator
+from typing import AsyncIterator, Iterator
+
+import numpy as np
+
+# Klines per batch when fetch_kline_batches falls back to grouping fetch_klines
+KLINE_BATCH_SIZE = 1000
 
 
 class MarketType(str, Enum):
@@ -31,6 +36,115 @@ class Kline:
     quote_volume: float
 
 
+@dataclass
+class KlineBatch:
+    """Column-oriented block of candles for one exchange/market/symbol/interval.
+
+    Arrays are aligned by index and sorted by open_time.
+    """
+
+    exchange: str
+    market_type: MarketType
+    symbol: str
+    interval: str
+    open_time: np.ndarray  # int64 epoch milliseconds
+    open: np.ndarray  # float64
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    quote_volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.open_time)
+
+    def to_klines(self) -> Iterator[Kline]:
+        """Yield the batch as Kline objects.
+
+        Yields:
+            Kline objects in chronological order
+        """
+        columns = (self.open, self.high, self.low, self.close, self.volume, self.quote_volume)
+        for ts, open_, high, low, close, volume, quote_volume in zip(
+            self.open_time.tolist(), *(col.tolist() for col in columns)
+        ):
+            yield Kline(
+                exchange=self.exchange,
+                market_type=self.market_type,
+                symbol=self.symbol,
+                interval=self.interval,
+                open_time=datetime.fromtimestamp(ts / 1000, tz=timezone.utc),
+                open=open_,
+                high=high,
+                low=low,
+                close=close,
+                volume=volume,
+                quote_volume=quote_volume,
+            )
+
+    @classmethod
+    def from_klines(cls, klines: list[Kline]) -> "KlineBatch":
+        """Build a batch from Kline objects sharing exchange/market/symbol/interval.
+
+        Args:
+            klines: Non-empty list of Kline objects in chronological order
+
+        Returns:
+            KlineBatch with one array per field
+        """
+        first = klines[0]
+
+        def column(attr: str) -> np.ndarray:
+            return np.fromiter(
+                (getattr(k, attr) for k in klines), dtype=np.float64, count=len(klines)
+            )
+
+        return cls(
+            exchange=first.exchange,
+            market_type=first.market_type,
+            symbol=first.symbol,
+            interval=first.interval,
+            open_time=np.fromiter(
+                (int(k.open_time.timestamp() * 1000) for k in klines),
+                dtype=np.int64,
+                count=len(klines),
+            ),
+            open=column("open"),
+            high=column("high"),
+            low=column("low"),
+            close=column("close"),
+            volume=column("volume"),
+            quote_volume=column("quote_volume"),
+        )
+
+    @classmethod
+    def concat(cls, batches: list["KlineBatch"]) -> "KlineBatch":
+        """Join batches sharing exchange/market/symbol/interval end to end.
+
+        Args:
+            batches: Non-empty list of batches in chronological order
+
+        Returns:
+            KlineBatch holding the rows of every batch
+        """
+        if len(batches) == 1:
+            return batches[0]
+        first = batches[0]
+        return cls(
+            exchange=first.exchange,
+            market_type=first.market_type,
+            symbol=first.symbol,
+            interval=first.interval,
+            open_time=np.concatenate([b.open_time for b in batches]),
+            open=np.concatenate([b.open for b in batches]),
+            high=np.concatenate([b.high for b in batches]),
+            low=np.concatenate([b.low for b in batches]),
+            close=np.concatenate([b.close for b in batches]),
+            volume=np.concatenate([b.volume for b in batches]),
+            quote_volume=np.concatenate([b.quote_volume for b in batches]),
+        )
+
+
 @dataclass
 class OpenInterest:
     """Open interest snapshot."""
@@ -80,6 +194,38 @@ class ExchangeConnector(ABC):
         """
         ...
 
+    async def fetch_kline_batches(
+        self,
+        symbol: str,
+        interval: str,
+        market_type: MarketType,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+    ) -> AsyncIterator[KlineBatch]:
+        """Fetch historical klines as column-oriented batches.
+
+        The default implementation groups fetch_klines output; connectors
+        override it to build batches straight from decoded pages.
+
+        Args:
+            symbol: Trading pair symbol (e.g., COAIUSDT)
+            interval: Kline interval (1h, 4h, 1d)
+            market_type: Spot or perpetual
+            start_time: Start of range (None = earliest available)
+            end_time: End of range (None = now)
+
+        Yields:
+            KlineBatch objects, each in chronological order
+        """
+        klines: list[Kline] = []
+        async for kline in self.fetch_klines(symbol, interval, market_type, start_time, end_time):
+            klines.append(kline)
+            if len(klines) >= KLINE_BATCH_SIZE:
+                yield KlineBatch.from_klines(klines)
+                klines = []
+        if klines:
+            yield KlineBatch.from_klines(klines)
+
     @abstractmethod
     async def fetch_open_interest_history(
         self,
@@ -1,15 +1,25 @@
 """Binance exchange connector for spot and perpetual futures."""
 
 import asyncio
-from datetime import datetime, timezone
-from typing import AsyncIterator
+from datetime import datetime, timedelta, timezone
+from operator import itemgetter
+from typing import Any, AsyncIterator, Callable
 
 import httpx
+import numpy as np
 
-from src.connectors.base import ExchangeConnector, FundingRate, Kline, MarketType, OpenInterest
+from src.connectors.base import FundingRate, Kline, KlineBatch, MarketType, OpenInterest
+from src.connectors.rest import RestConnector
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
 
-class BinanceConnector(ExchangeConnector):
+
+def _from_ms(ms: int) -> datetime:
+    """Convert a Binance millisecond timestamp to a UTC datetime."""
+    return _EPOCH + timedelta(milliseconds=ms)
+
+
+class BinanceConnector(RestConnector):
     """Binance spot and perpetual futures connector."""
 
     name = "binance"
@@ -21,14 +31,98 @@ class BinanceConnector(ExchangeConnector):
     KLINE_LIMIT = 1000
     OI_LIMIT = 500
 
-    def __init__(self):
-        """Initialize Binance connector."""
-        self._client = httpx.AsyncClient(timeout=30.0)
-        self._rate_limit_delay = 0.1  # 100ms between requests
+    MAX_CONCURRENT_REQUESTS = 5
+    # USD-M futures allow 2400 request weight per minute per IP, and a
+    # 1000-row kline page weighs 5; spot's 6000 is looser, so the futures
+    # budget sizes the shared limiter
+    WEIGHT_PER_MINUTE = 2400
+    KLINE_PAGE_WEIGHT = 5
+    REQUESTS_PER_SECOND = WEIGHT_PER_MINUTE / KLINE_PAGE_WEIGHT / 60
+    # 418 is the IP ban that follows ignored 429s; both carry Retry-After
+    RATE_LIMIT_STATUSES = frozenset({418, 429})
+    INTERVAL_MS = {"1h": 3_600_000, "4h": 14_400_000, "1d": 86_400_000}
+    FUNDING_INTERVAL_MS = 8 * 3_600_000
+
+    async def _fetch_window(
+        self,
+        url: str,
+        params: dict,
+        limit: int,
+        time_of: Callable[[Any], int],
+        error_prefix: str,
+    ) -> list:
+        """Fetch every row between params' startTime and endTime.
+
+        Follows up serially if a page comes back full, so the result is
+        complete even if the window was sized for a longer data interval.
 
-    async def close(self) -> None:
-        """Close HTTP client."""
-        await self._client.aclose()
+        Args:
+            url: Full endpoint URL
+            params: Query parameters including startTime and endTime
+            limit: Page size limit
+            time_of: Returns a row's timestamp in ms
+            error_prefix: Prefix for the RuntimeError raised on HTTP failure
+
+        Returns:
+            Rows in chronological order
+        """
+        params = dict(params)
+        rows: list = []
+        while True:
+            data = await self._get_json(url, params, error_prefix)
+            rows.extend(data)
+            if len(data) < limit:
+                return rows
+            params["startTime"] = time_of(data[-1]) + 1
+            if params["startTime"] > params["endTime"]:
+                return rows
+
+    async def _paginate(
+        self,
+        url: str,
+        params: dict,
+        limit: int,
+        step_ms: int,
+        time_of: Callable[[Any], int],
+        error_prefix: str,
+    ) -> AsyncIterator[list]:
+        """Paginate forwards, fetching pages after the first concurrently.
+
+        The first request probes where the data starts. The rest of the range
+        up to endTime (or now) is split into windows of step_ms, which are
+        fetched MAX_CONCURRENT_REQUESTS at a time and yielded in order.
+
+        Args:
+            url: Full endpoint URL
+            params: Query parameters for the first page
+            limit: Page size limit
+            step_ms: Time span expected to fill one page
+            time_of: Returns a row's timestamp in ms
+            error_prefix: Prefix for the RuntimeError raised on HTTP failure
+
+        Yields:
+            Pages of rows in chronological order
+        """
+        data = await self._get_json(url, params, error_prefix)
+        if not data:
+            return
+        yield data
+        if len(data) < limit:
+            return
+
+        end_ms = params.get("endTime") or int(datetime.now(tz=timezone.utc).timestamp() * 1000)
+        windows = [
+            {**params, "startTime": start, "endTime": min(start + step_ms - 1, end_ms)}
+            for start in range(time_of(data[-1]) + 1, end_ms + 1, step_ms)
+        ]
+        for i in range(0, len(windows), self.MAX_CONCURRENT_REQUESTS):
+            pages = await asyncio.gather(*(
+                self._fetch_window(url, window, limit, time_of, error_prefix)
+                for window in windows[i:i + self.MAX_CONCURRENT_REQUESTS]
+            ))
+            for page in pages:
+                if page:
+                    yield page
 
     async def get_symbol(self, base_asset: str) -> str | None:
         """Get trading symbol for base asset.
@@ -62,15 +156,15 @@ class BinanceConnector(ExchangeConnector):
             pass
         return None
 
-    async def fetch_klines(
+    def _kline_pages(
         self,
         symbol: str,
         interval: str,
         market_type: MarketType,
-        start_time: datetime | None = None,
-        end_time: datetime | None = None,
-    ) -> AsyncIterator[Kline]:
-        """Fetch historical klines with pagination.
+        start_time: datetime | None,
+        end_time: datetime | None,
+    ) -> AsyncIterator[list]:
+        """Paginate raw kline rows forwards from start_time (or the listing).
 
         Args:
             symbol: Trading pair symbol
@@ -79,8 +173,8 @@ class BinanceConnector(ExchangeConnector):
             start_time: Start of range
             end_time: End of range
 
-        Yields:
-            Kline objects
+        Returns:
+            Async iterator over pages of raw Binance kline rows
         """
         base_url = (
             self.SPOT_BASE_URL if market_type == MarketType.SPOT else self.FUTURES_BASE_URL
@@ -91,59 +185,84 @@ class BinanceConnector(ExchangeConnector):
             "symbol": symbol,
             "interval": interval,
             "limit": self.KLINE_LIMIT,
+            # startTime=0 makes Binance return from the earliest listed candle
+            "startTime": int(start_time.timestamp() * 1000) if start_time else 0,
         }
         if end_time:
             params["endTime"] = int(end_time.timestamp() * 1000)
 
-        # Paginate backwards to get all historical data (like ByBit)
-        all_klines = []
+        return self._paginate(
+            f"{base_url}{endpoint}",
+            params,
+            limit=self.KLINE_LIMIT,
+            step_ms=self.KLINE_LIMIT * self.INTERVAL_MS.get(interval, self.INTERVAL_MS["1h"]),
+            time_of=itemgetter(0),
+            error_prefix="Binance API error",
+        )
 
-        while True:
-            await asyncio.sleep(self._rate_limit_delay)
-            try:
-                resp = await self._client.get(f"{base_url}{endpoint}", params=params)
-                resp.raise_for_status()
-                data = resp.json()
-            except httpx.HTTPError as e:
-                raise RuntimeError(f"Binance API error: {e}") from e
-
-            if not data:
-                break
-
-            for candle in data:
-                open_time = datetime.fromtimestamp(candle[0] / 1000, tz=timezone.utc)
-                # Check if we've gone before start_time
-                if start_time and open_time < start_time:
-                    continue
-                all_klines.append(
-                    Kline(
-                        exchange=self.name,
-                        market_type=market_type,
-                        symbol=symbol,
-                        interval=interval,
-                        open_time=open_time,
-                        open=float(candle[1]),
-                        high=float(candle[2]),
-                        low=float(candle[3]),
-                        close=float(candle[4]),
-                        volume=float(candle[5]),
-                        quote_volume=float(candle[7]),
-                    )
-                )
+    async def fetch_klines(
+        self,
+        symbol: str,
+        interval: str,
+        market_type: MarketType,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+    ) -> AsyncIterator[Kline]:
+        """Fetch historical klines with pagination.
+
+        Args:
+            symbol: Trading pair symbol
+            interval: Kline interval (1h, 4h, 1d)
+            market_type: Spot or perpetual
+            start_time: Start of range
+            end_time: End of range
 
-            # Check if we got less than limit (no more data)
-            if len(data) < self.KLINE_LIMIT:
-                break
+        Yields:
+            Kline objects
+        """
+        async for batch in self.fetch_kline_batches(
+            symbol, interval, market_type, start_time, end_time
+        ):
+            for kline in batch.to_klines():
+                yield kline
 
-            # Move end time backwards for next page
-            earliest_time = data[0][0]
-            if start_time and earliest_time <= int(start_time.timestamp() * 1000):
-                break
-            params["endTime"] = earliest_time - 1
+    async def fetch_kline_batches(
+        self,
+        symbol: str,
+        interval: str,
+        market_type: MarketType,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+    ) -> AsyncIterator[KlineBatch]:
+        """Fetch historical klines as column-oriented batches, one per page.
 
-        # Yield in chronological order
-        for kline in sorted(all_klines, key=lambda k: k.open_time):
-            yield kline
+        Args:
+            symbol: Trading pair symbol
+            interval: Kline interval (1h, 4h, 1d)
+            market_type: Spot or perpetual
+            start_time: Start of range
+            end_time: End of range
+
+        Yields:
+            KlineBatch objects in chronological order
+        """
+        # Each page is already in chronological order, so batches can be
+        # yielded as they arrive
+        async for page in self._kline_pages(symbol, interval, market_type, start_time, end_time):
+            rows = np.array(page, dtype=object)
+            yield KlineBatch(
+                exchange=self.name,
+                market_type=market_type,
+                symbol=symbol,
+                interval=interval,
+                open_time=rows[:, 0].astype(np.int64),
+                open=rows[:, 1].astype(np.float64),
+                high=rows[:, 2].astype(np.float64),
+                low=rows[:, 3].astype(np.float64),
+                close=rows[:, 4].astype(np.float64),
+                volume=rows[:, 5].astype(np.float64),
+                quote_volume=rows[:, 7].astype(np.float64),
+            )
 
     async def fetch_open_interest_history(
         self,
@@ -177,38 +296,23 @@ class BinanceConnector(ExchangeConnector):
         if end_time:
             params["endTime"] = int(end_time.timestamp() * 1000)
 
-        while True:
-            await asyncio.sleep(self._rate_limit_delay)
-            try:
-                resp = await self._client.get(
-                    f"{self.DATA_BASE_URL}/futures/data/openInterestHist",
-                    params=params,
-                )
-                resp.raise_for_status()
-                data = resp.json()
-            except httpx.HTTPError as e:
-                raise RuntimeError(f"Binance OI API error: {e}") from e
-
-            if not data:
-                break
-
-            for item in data:
+        async for page in self._paginate(
+            f"{self.DATA_BASE_URL}/futures/data/openInterestHist",
+            params,
+            limit=self.OI_LIMIT,
+            step_ms=self.OI_LIMIT * self.INTERVAL_MS[period],
+            time_of=itemgetter("timestamp"),
+            error_prefix="Binance OI API error",
+        ):
+            for item in page:
                 yield OpenInterest(
                     exchange=self.name,
                     symbol=symbol,
-                    timestamp=datetime.fromtimestamp(item["timestamp"] / 1000, tz=timezone.utc),
+                    timestamp=_from_ms(item["timestamp"]),
                     open_interest=float(item["sumOpenInterest"]),
                     open_interest_value=float(item["sumOpenInterestValue"]),
                 )
 
-            # Check if we got less than limit
-            if len(data) < self.OI_LIMIT:
-                break
-
-            # Move start time forward
-            last_time = data[-1]["timestamp"]
-            params["startTime"] = last_time + 1
-
     async def fetch_funding_history(
         self,
         symbol: str,
@@ -234,35 +338,18 @@ class BinanceConnector(ExchangeConnector):
         if end_time:
             params["endTime"] = int(end_time.timestamp() * 1000)
 
-        while True:
-            await asyncio.sleep(self._rate_limit_delay)
-            try:
-                resp = await self._client.get(
-                    f"{self.FUTURES_BASE_URL}/fapi/v1/fundingRate",
-                    params=params,
-                )
-                resp.raise_for_status()
-                data = resp.json()
-            except httpx.HTTPError as e:
-                raise RuntimeError(f"Binance funding API error: {e}") from e
-
-            if not data:
-                break
-
-            for item in data:
+        async for page in self._paginate(
+            f"{self.FUTURES_BASE_URL}/fapi/v1/fundingRate",
+            params,
+            limit=self.KLINE_LIMIT,
+            step_ms=self.KLINE_LIMIT * self.FUNDING_INTERVAL_MS,
+            time_of=itemgetter("fundingTime"),
+            error_prefix="Binance funding API error",
+        ):
+            for item in page:
                 yield FundingRate(
                     exchange=self.name,
                     symbol=symbol,
-                    funding_time=datetime.fromtimestamp(
-                        item["fundingTime"] / 1000, tz=timezone.utc
-                    ),
+                    funding_time=_from_ms(item["fundingTime"]),
                     funding_rate=float(item["fundingRate"]),
                 )
-
-            # Check if we got less than limit
-            if len(data) < self.KLINE_LIMIT:
-                break
-
-            # Move start time forward for next page
-            last_time = data[-1]["fundingTime"]
-            params["startTime"] = last_time + 1
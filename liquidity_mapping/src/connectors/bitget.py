@@ -2,14 +2,17 @@
 
 import asyncio
 from datetime import datetime, timezone
+from operator import attrgetter
 from typing import AsyncIterator
 
 import httpx
+import orjson
 
-from src.connectors.base import ExchangeConnector, FundingRate, Kline, MarketType, OpenInterest
+from src.connectors.base import FundingRate, MarketType, OpenInterest
+from src.connectors.rest import WindowedKlineConnector
 
 
-class BitgetConnector(ExchangeConnector):
+class BitgetConnector(WindowedKlineConnector):
     """BitGet spot and perpetual futures connector."""
 
     name = "bitget"
@@ -17,16 +20,34 @@ class BitgetConnector(ExchangeConnector):
     SPOT_BASE_URL = "https://api.bitget.com"
     FUTURES_BASE_URL = "https://api.bitget.com"
     KLINE_LIMIT = 1000
+    # history-candles works best with 200
+    FUTURES_KLINE_LIMIT = 200
     OI_LIMIT = 100
 
-    def __init__(self):
-        """Initialize BitGet connector."""
-        self._client = httpx.AsyncClient(timeout=30.0)
-        self._rate_limit_delay = 0.1
+    MAX_CONCURRENT_REQUESTS = 8
+    REQUESTS_PER_SECOND = 20
+    RATE_LIMIT_CODE = "429"
+    API_ERROR = "BitGet API error"
+    # Kline interval -> BitGet granularity parameter
+    INTERVALS = {"1h": "1H", "4h": "4H", "1d": "1D"}
 
-    async def close(self) -> None:
-        """Close HTTP client."""
-        await self._client.aclose()
+    def _decode(self, resp: httpx.Response, error_prefix: str) -> dict | None:
+        """Unwrap BitGet's code envelope.
+
+        Args:
+            resp: HTTP response
+            error_prefix: Prefix for the RuntimeError raised on API errors
+
+        Returns:
+            Decoded response with code 00000, or None when code is 429
+            (rate limited)
+        """
+        data = orjson.loads(resp.content)
+        if data.get("code") == self.RATE_LIMIT_CODE:
+            return None
+        if data.get("code") != "00000":
+            raise RuntimeError(f"{error_prefix}: {data.get('msg')}")
+        return data
 
     async def get_symbol(self, base_asset: str) -> str | None:
         """Get trading symbol for base asset.
@@ -38,128 +59,90 @@ class BitgetConnector(ExchangeConnector):
             Full symbol or None
         """
         symbol = f"{base_asset.upper()}USDT"
-        # Check spot first
-        try:
-            resp = await self._client.get(
+        # Check spot and futures concurrently
+        results = await asyncio.gather(
+            self._get_json(
                 f"{self.SPOT_BASE_URL}/api/v2/spot/market/tickers",
-                params={"symbol": symbol},
-            )
-            data = resp.json()
-            if data.get("code") == "00000" and data.get("data"):
-                return symbol
-        except httpx.HTTPError:
-            pass
-        # Check futures
-        try:
-            resp = await self._client.get(
+                {"symbol": symbol},
+                self.API_ERROR,
+            ),
+            self._get_json(
                 f"{self.FUTURES_BASE_URL}/api/v2/mix/market/ticker",
-                params={"symbol": symbol, "productType": "USDT-FUTURES"},
-            )
-            data = resp.json()
-            if data.get("code") == "00000" and data.get("data"):
+                {"symbol": symbol, "productType": "USDT-FUTURES"},
+                self.API_ERROR,
+            ),
+            return_exceptions=True,
+        )
+        for data in results:
+            if not isinstance(data, BaseException) and data.get("data"):
                 return symbol
-        except httpx.HTTPError:
-            pass
         return None
 
-    async def fetch_klines(
-        self,
-        symbol: str,
-        interval: str,
-        market_type: MarketType,
-        start_time: datetime | None = None,
-        end_time: datetime | None = None,
-    ) -> AsyncIterator[Kline]:
-        """Fetch historical klines with pagination.
+    def _kline_request(
+        self, symbol: str, interval: str, market_type: MarketType
+    ) -> tuple[str, dict, int]:
+        """Describe the candle request (1h, 4h, 1d -> 1H, 4H, 1D).
 
         Args:
             symbol: Trading pair symbol
-            interval: Kline interval (1h, 4h, 1d -> 1H, 4H, 1D)
+            interval: Kline interval (1h, 4h, 1d)
             market_type: Spot or perpetual
-            start_time: Start of range
-            end_time: End of range
 
-        Yields:
-            Kline objects
+        Returns:
+            Tuple of (endpoint URL, base query parameters, rows in a full page)
         """
-        # Map interval to BitGet format
-        interval_map = {"1h": "1H", "4h": "4H", "1d": "1D"}
-        bitget_interval = interval_map.get(interval, "1H")
-
+        granularity = self.INTERVALS.get(interval, "1H")
         if market_type == MarketType.SPOT:
-            endpoint = "/api/v2/spot/market/candles"
-            params: dict = {
-                "symbol": symbol,
-                "granularity": bitget_interval,
-                "limit": str(self.KLINE_LIMIT),
-            }
-        else:
-            # For futures, use history-candles endpoint which supports full pagination
-            endpoint = "/api/v2/mix/market/history-candles"
             params = {
                 "symbol": symbol,
-                "productType": "USDT-FUTURES",
-                "granularity": bitget_interval,
-                "limit": "200",  # history-candles works best with 200
+                "granularity": granularity,
+                "limit": str(self.KLINE_LIMIT),
             }
+            return (
+                f"{self.SPOT_BASE_URL}/api/v2/spot/market/candles",
+                params,
+                self.KLINE_LIMIT,
+            )
+        # For futures, use history-candles endpoint which supports full pagination
+        params = {
+            "symbol": symbol,
+            "productType": "USDT-FUTURES",
+            "granularity": granularity,
+            "limit": str(self.FUTURES_KLINE_LIMIT),
+        }
+        return (
+            f"{self.FUTURES_BASE_URL}/api/v2/mix/market/history-candles",
+            params,
+            self.FUTURES_KLINE_LIMIT,
+        )
+
+    def _time_params(self, start_ms: int | None, end_ms: int | None) -> dict:
+        """Bound a candle request with BitGet's startTime/endTime parameters.
 
-        if end_time:
-            params["endTime"] = str(int(end_time.timestamp() * 1000))
-
-        all_klines = []
-
-        while True:
-            await asyncio.sleep(self._rate_limit_delay)
-            try:
-                resp = await self._client.get(
-                    f"{self.SPOT_BASE_URL}{endpoint}",
-                    params=params,
-                )
-                data = resp.json()
-                if data.get("code") != "00000":
-                    raise RuntimeError(f"BitGet API error: {data.get('msg')}")
-                kline_list = data.get("data", [])
-            except httpx.HTTPError as e:
-                raise RuntimeError(f"BitGet API error: {e}") from e
-
-            if not kline_list:
-                break
+        Args:
+            start_ms: Window start in ms (None = unbounded)
+            end_ms: Window end in ms (None = unbounded)
 
-            for candle in kline_list:
-                # BitGet format: [timestamp, open, high, low, close, volume, quoteVolume]
-                open_time = datetime.fromtimestamp(int(candle[0]) / 1000, tz=timezone.utc)
-                if start_time and open_time < start_time:
-                    continue
-                all_klines.append(
-                    Kline(
-                        exchange=self.name,
-                        market_type=market_type,
-                        symbol=symbol,
-                        interval=interval,
-                        open_time=open_time,
-                        open=float(candle[1]),
-                        high=float(candle[2]),
-                        low=float(candle[3]),
-                        close=float(candle[4]),
-                        volume=float(candle[5]),
-                        quote_volume=float(candle[6]) if len(candle) > 6 else 0.0,
-                    )
-                )
+        Returns:
+            Parameters for the bounds that are set
+        """
+        params = {}
+        if start_ms is not None:
+            params["startTime"] = str(start_ms)
+        if end_ms is not None:
+            params["endTime"] = str(end_ms)
+        return params
 
-            # Check if we got a full page (200 for futures, KLINE_LIMIT for spot)
-            page_limit = 200 if market_type != MarketType.SPOT else self.KLINE_LIMIT
-            if len(kline_list) < page_limit:
-                break
+    def _candle_rows(self, data: dict) -> list[list]:
+        """Extract candle rows, [timestamp, open, high, low, close, volume, quoteVolume].
 
-            # Move end time backwards (Bitget returns chronological order, so [0] is oldest)
-            earliest_time = int(kline_list[0][0])
-            if start_time and earliest_time <= int(start_time.timestamp() * 1000):
-                break
-            params["endTime"] = str(earliest_time - 1)
+        Args:
+            data: Decoded candle response
 
-        # Yield in chronological order
-        for kline in reversed(all_klines):
-            yield kline
+        Returns:
+            Raw candle rows, oldest first
+        """
+        return data.get("data", [])
 
     async def fetch_open_interest_history(
         self,
@@ -181,32 +164,26 @@ class BitgetConnector(ExchangeConnector):
         Yields:
             OpenInterest objects
         """
-        await asyncio.sleep(self._rate_limit_delay)
-        try:
-            resp = await self._client.get(
-                f"{self.FUTURES_BASE_URL}/api/v2/mix/market/open-interest",
-                params={
-                    "symbol": symbol,
-                    "productType": "USDT-FUTURES",
-                },
+        data = await self._get_json(
+            f"{self.FUTURES_BASE_URL}/api/v2/mix/market/open-interest",
+            {
+                "symbol": symbol,
+                "productType": "USDT-FUTURES",
+            },
+            "BitGet OI API error",
+        )
+
+        oi_data = data.get("data", {})
+        oi_list = oi_data.get("openInterestList", [])
+        if oi_list:
+            item = oi_list[0]
+            yield OpenInterest(
+                exchange=self.name,
+                symbol=symbol,
+                timestamp=datetime.now(tz=timezone.utc),
+                open_interest=float(item.get("size", 0)),
+                open_interest_value=0.0,  # BitGet doesn't provide USD value
             )
-            data = resp.json()
-            if data.get("code") != "00000":
-                raise RuntimeError(f"BitGet OI API error: {data.get('msg')}")
-
-            oi_data = data.get("data", {})
-            oi_list = oi_data.get("openInterestList", [])
-            if oi_list:
-                item = oi_list[0]
-                yield OpenInterest(
-                    exchange=self.name,
-                    symbol=symbol,
-                    timestamp=datetime.now(tz=timezone.utc),
-                    open_interest=float(item.get("size", 0)),
-                    open_interest_value=0.0,  # BitGet doesn't provide USD value
-                )
-        except httpx.HTTPError as e:
-            raise RuntimeError(f"BitGet OI API error: {e}") from e
 
     async def fetch_funding_history(
         self,
@@ -224,55 +201,61 @@ class BitgetConnector(ExchangeConnector):
         Yields:
             FundingRate objects in chronological order
         """
+        start_ms = int(start_time.timestamp() * 1000) if start_time else None
+        end_ms = int(end_time.timestamp() * 1000) if end_time else None
+
         all_funding = []
         page_no = 1
         page_size = 100  # Max 100
 
         while True:
-            await asyncio.sleep(self._rate_limit_delay)
-            try:
-                resp = await self._client.get(
-                    f"{self.FUTURES_BASE_URL}/api/v2/mix/market/history-fund-rate",
-                    params={
-                        "symbol": symbol,
-                        "productType": "USDT-FUTURES",
-                        "pageSize": str(page_size),
-                        "pageNo": str(page_no),
-                    },
-                )
-                data = resp.json()
-                if data.get("code") != "00000":
-                    raise RuntimeError(f"BitGet funding API error: {data.get('msg')}")
-                funding_list = data.get("data", [])
-            except httpx.HTTPError as e:
-                raise RuntimeError(f"BitGet funding API error: {e}") from e
+            data = await self._get_json(
+                f"{self.FUTURES_BASE_URL}/api/v2/mix/market/history-fund-rate",
+                {
+                    "symbol": symbol,
+                    "productType": "USDT-FUTURES",
+                    "pageSize": str(page_size),
+                    "pageNo": str(page_no),
+                },
+                "BitGet funding API error",
+            )
+            funding_list = data.get("data", [])
 
             if not funding_list:
                 break
 
             for item in funding_list:
-                ts = datetime.fromtimestamp(
-                    int(item["fundingTime"]) / 1000, tz=timezone.utc
-                )
-                # Apply time filters
-                if start_time and ts < start_time:
+                # Apply time filters before building the datetime
+                ts_ms = int(item["fundingTime"])
+                if start_ms is not None and ts_ms < start_ms:
                     continue
-                if end_time and ts > end_time:
+                if end_ms is not None and ts_ms > end_ms:
                     continue
                 all_funding.append(
                     FundingRate(
                         exchange=self.name,
                         symbol=symbol,
-                        funding_time=ts,
+                        funding_time=datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc),
                         funding_rate=float(item["fundingRate"]),
                     )
                 )
 
             if len(funding_list) < page_size:
                 break
+            # Pages run newest first, so once one reaches back past start_time
+            # every later page is older still
+            if start_ms is not None and min(
+                int(item["fundingTime"]) for item in funding_list
+            ) < start_ms:
+                break
 
             page_no += 1
 
-        # Sort and yield in chronological order
-        for fr in sorted(all_funding, key=lambda x: x.funding_time):
+        # history-fund-rate serves newest first (page 1 is the latest), so the
+        # collected list only needs reversing. Fall back to a sort if a page
+        # ever arrives out of order.
+        all_funding.reverse()
+        if any(a.funding_time > b.funding_time for a, b in zip(all_funding, all_funding[1:])):
+            all_funding.sort(key=attrgetter("funding_time"))
+        for fr in all_funding:
             yield fr
@@ -5,11 +5,13 @@ from datetime import datetime, timezone
 from typing import AsyncIterator
 
 import httpx
+import orjson
 
-from src.connectors.base import ExchangeConnector, FundingRate, Kline, MarketType, OpenInterest
+from src.connectors.base import FundingRate, MarketType, OpenInterest
+from src.connectors.rest import WindowedKlineConnector
 
 
-class BybitConnector(ExchangeConnector):
+class BybitConnector(WindowedKlineConnector):
     """ByBit spot and perpetual futures connector."""
 
     name = "bybit"
@@ -18,14 +20,30 @@ class BybitConnector(ExchangeConnector):
     KLINE_LIMIT = 1000
     OI_LIMIT = 200
 
-    def __init__(self):
-        """Initialize ByBit connector."""
-        self._client = httpx.AsyncClient(timeout=30.0)
-        self._rate_limit_delay = 0.1
+    MAX_CONCURRENT_REQUESTS = 8
+    REQUESTS_PER_SECOND = 10
+    RATE_LIMIT_RET_CODE = 10006
+    API_ERROR = "ByBit API error"
+    # Kline interval -> ByBit interval parameter
+    INTERVALS = {"1h": "60", "4h": "240", "1d": "D"}
 
-    async def close(self) -> None:
-        """Close HTTP client."""
-        await self._client.aclose()
+    def _decode(self, resp: httpx.Response, error_prefix: str) -> dict | None:
+        """Unwrap ByBit's retCode envelope.
+
+        Args:
+            resp: HTTP response
+            error_prefix: Prefix for the RuntimeError raised on API errors
+
+        Returns:
+            Decoded response with retCode 0, or None when retCode is 10006
+            (rate limited)
+        """
+        data = orjson.loads(resp.content)
+        if data.get("retCode") == self.RATE_LIMIT_RET_CODE:
+            return None
+        if data.get("retCode") != 0:
+            raise RuntimeError(f"{error_prefix}: {data.get('retMsg')}")
+        return data
 
     async def get_symbol(self, base_asset: str) -> str | None:
         """Get trading symbol for base asset.
@@ -37,108 +55,71 @@ class BybitConnector(ExchangeConnector):
             Full symbol or None
         """
         symbol = f"{base_asset.upper()}USDT"
-        # Check both spot and linear (perp) markets
-        for category in ["spot", "linear"]:
-            try:
-                resp = await self._client.get(
+        # Check spot and linear (perp) markets concurrently
+        results = await asyncio.gather(
+            *(
+                self._get_json(
                     f"{self.BASE_URL}/v5/market/tickers",
-                    params={"category": category, "symbol": symbol},
+                    {"category": category, "symbol": symbol},
+                    self.API_ERROR,
                 )
-                data = resp.json()
-                if data.get("retCode") == 0 and data.get("result", {}).get("list"):
-                    return symbol
-            except httpx.HTTPError:
-                pass
+                for category in ["spot", "linear"]
+            ),
+            return_exceptions=True,
+        )
+        for data in results:
+            if not isinstance(data, BaseException) and data.get("result", {}).get("list"):
+                return symbol
         return None
 
-    async def fetch_klines(
-        self,
-        symbol: str,
-        interval: str,
-        market_type: MarketType,
-        start_time: datetime | None = None,
-        end_time: datetime | None = None,
-    ) -> AsyncIterator[Kline]:
-        """Fetch historical klines with pagination.
+    def _kline_request(
+        self, symbol: str, interval: str, market_type: MarketType
+    ) -> tuple[str, dict, int]:
+        """Describe the candle request (1h -> 60, 4h -> 240, 1d -> D).
 
         Args:
             symbol: Trading pair symbol
-            interval: Kline interval (1h -> 60, 4h -> 240, 1d -> D)
+            interval: Kline interval (1h, 4h, 1d)
             market_type: Spot or perpetual
-            start_time: Start of range
-            end_time: End of range
 
-        Yields:
-            Kline objects
+        Returns:
+            Tuple of (endpoint URL, base query parameters, rows in a full page)
         """
-        # Map interval to ByBit format
-        interval_map = {"1h": "60", "4h": "240", "1d": "D"}
-        bybit_interval = interval_map.get(interval, "60")
-
-        category = "spot" if market_type == MarketType.SPOT else "linear"
-
-        params: dict = {
-            "category": category,
+        params = {
+            "category": "spot" if market_type == MarketType.SPOT else "linear",
             "symbol": symbol,
-            "interval": bybit_interval,
+            "interval": self.INTERVALS.get(interval, "60"),
             "limit": self.KLINE_LIMIT,
         }
-        if end_time:
-            params["end"] = int(end_time.timestamp() * 1000)
+        return f"{self.BASE_URL}/v5/market/kline", params, self.KLINE_LIMIT
 
-        # ByBit returns data in reverse chronological order, so we paginate backwards
-        all_klines = []
+    def _time_params(self, start_ms: int | None, end_ms: int | None) -> dict:
+        """Bound a candle request with ByBit's start/end parameters.
 
-        while True:
-            await asyncio.sleep(self._rate_limit_delay)
-            try:
-                resp = await self._client.get(
-                    f"{self.BASE_URL}/v5/market/kline",
-                    params=params,
-                )
-                data = resp.json()
-                if data.get("retCode") != 0:
-                    raise RuntimeError(f"ByBit API error: {data.get('retMsg')}")
-                kline_list = data.get("result", {}).get("list", [])
-            except httpx.HTTPError as e:
-                raise RuntimeError(f"ByBit API error: {e}") from e
-
-            if not kline_list:
-                break
+        Args:
+            start_ms: Window start in ms (None = unbounded)
+            end_ms: Window end in ms (None = unbounded)
 
-            for candle in kline_list:
-                open_time = datetime.fromtimestamp(int(candle[0]) / 1000, tz=timezone.utc)
-                # Check if we've gone before start_time
-                if start_time and open_time < start_time:
-                    continue
-                all_klines.append(
-                    Kline(
-                        exchange=self.name,
-                        market_type=market_type,
-                        symbol=symbol,
-                        interval=interval,
-                        open_time=open_time,
-                        open=float(candle[1]),
-                        high=float(candle[2]),
-                        low=float(candle[3]),
-                        close=float(candle[4]),
-                        volume=float(candle[5]),
-                        quote_volume=float(candle[6]),
-                    )
-                )
+        Returns:
+            Parameters for the bounds that are set
+        """
+        params = {}
+        if start_ms is not None:
+            params["start"] = start_ms
+        if end_ms is not None:
+            params["end"] = end_ms
+        return params
 
-            if len(kline_list) < self.KLINE_LIMIT:
-                break
+    def _candle_rows(self, data: dict) -> list[list]:
+        """Extract candle rows, [startTime, open, high, low, close, volume, turnover].
 
-            # Move end time backwards for next page
-            earliest_time = int(kline_list[-1][0])
-            if start_time and earliest_time <= int(start_time.timestamp() * 1000):
-                break
-            params["end"] = earliest_time - 1
+        Args:
+            data: Decoded candle response
 
-        # Yield in chronological order
-        for kline in reversed(all_klines):
-            yield kline
+        Returns:
+            Raw candle rows, newest first
+        """
+        return data.get("result", {}).get("list", [])
 
     async def fetch_open_interest_history(
         self,
@@ -164,37 +145,34 @@ class BybitConnector(ExchangeConnector):
         # ByBit doesn't have historical OI API like Binance
         # We can only get current OI snapshot
         # For historical data, you'd need to collect over time
-        await asyncio.sleep(self._rate_limit_delay)
-        try:
-            resp = await self._client.get(
-                f"{self.BASE_URL}/v5/market/open-interest",
-                params={
-                    "category": "linear",
-                    "symbol": symbol,
-                    "intervalTime": "1h",
-                    "limit": self.OI_LIMIT,
-                },
+        data = await self._get_json(
+            f"{self.BASE_URL}/v5/market/open-interest",
+            {
+                "category": "linear",
+                "symbol": symbol,
+                "intervalTime": "1h",
+                "limit": self.OI_LIMIT,
+            },
+            "ByBit OI API error",
+        )
+
+        start_ms = int(start_time.timestamp() * 1000) if start_time else None
+        end_ms = int(end_time.timestamp() * 1000) if end_time else None
+
+        oi_list = data.get("result", {}).get("list", [])
+        for item in reversed(oi_list):  # Chronological order
+            ts_ms = int(item["timestamp"])
+            if start_ms is not None and ts_ms < start_ms:
+                continue
+            if end_ms is not None and ts_ms > end_ms:
+                continue
+            yield OpenInterest(
+                exchange=self.name,
+                symbol=symbol,
+                timestamp=datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc),
+                open_interest=float(item["openInterest"]),
+                open_interest_value=0.0,  # ByBit doesn't provide OI value directly
             )
-            data = resp.json()
-            if data.get("retCode") != 0:
-                raise RuntimeError(f"ByBit OI API error: {data.get('retMsg')}")
-
-            oi_list = data.get("result", {}).get("list", [])
-            for item in reversed(oi_list):  # Chronological order
-                ts = datetime.fromtimestamp(int(item["timestamp"]) / 1000, tz=timezone.utc)
-                if start_time and ts < start_time:
-                    continue
-                if end_time and ts > end_time:
-                    continue
-                yield OpenInterest(
-                    exchange=self.name,
-                    symbol=symbol,
-                    timestamp=ts,
-                    open_interest=float(item["openInterest"]),
-                    open_interest_value=0.0,  # ByBit doesn't provide OI value directly
-                )
-        except httpx.HTTPError as e:
-            raise RuntimeError(f"ByBit OI API error: {e}") from e
 
     async def fetch_funding_history(
         self,
@@ -217,41 +195,34 @@ class BybitConnector(ExchangeConnector):
             "symbol": symbol,
             "limit": self.OI_LIMIT,  # Max 200
         }
-        if start_time:
-            params["startTime"] = int(start_time.timestamp() * 1000)
+        start_ms = int(start_time.timestamp() * 1000) if start_time else None
+        if start_ms is not None:
+            params["startTime"] = start_ms
         if end_time:
             params["endTime"] = int(end_time.timestamp() * 1000)
 
         all_funding = []
 
         while True:
-            await asyncio.sleep(self._rate_limit_delay)
-            try:
-                resp = await self._client.get(
-                    f"{self.BASE_URL}/v5/market/funding/history",
-                    params=params,
-                )
-                data = resp.json()
-                if data.get("retCode") != 0:
-                    raise RuntimeError(f"ByBit funding API error: {data.get('retMsg')}")
-                funding_list = data.get("result", {}).get("list", [])
-            except httpx.HTTPError as e:
-                raise RuntimeError(f"ByBit funding API error: {e}") from e
+            data = await self._get_json(
+                f"{self.BASE_URL}/v5/market/funding/history",
+                params,
+                "ByBit funding API error",
+            )
+            funding_list = data.get("result", {}).get("list", [])
 
             if not funding_list:
                 break
 
             for item in funding_list:
-                ts = datetime.fromtimestamp(
-                    int(item["fundingRateTimestamp"]) / 1000, tz=timezone.utc
-                )
-                if start_time and ts < start_time:
+                ts_ms = int(item["fundingRateTimestamp"])
+                if start_ms is not None and ts_ms < start_ms:
                     continue
                 all_funding.append(
                     FundingRate(
                         exchange=self.name,
                         symbol=symbol,
-                        funding_time=ts,
+                        funding_time=datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc),
                         funding_rate=float(item["fundingRate"]),
                     )
                 )
@@ -261,10 +232,11 @@ class BybitConnector(ExchangeConnector):
 
             # Move end time backwards for next page (ByBit returns newest first)
             earliest_time = int(funding_list[-1]["fundingRateTimestamp"])
-            if start_time and earliest_time <= int(start_time.timestamp() * 1000):
+            if start_ms is not None and earliest_time <= start_ms:
                 break
             params["endTime"] = earliest_time - 1
 
         # Yield in chronological order
-        for fr in reversed(all_funding):
+        all_funding.reverse()
+        for fr in all_funding:
             yield fr
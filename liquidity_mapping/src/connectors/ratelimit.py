@@ -0,0 +1,91 @@
+"""Request rate limiting for exchange connectors."""
+
+import asyncio
+import random
+import time
+
+import httpx
+
+
+class TokenBucket:
+    """Async token bucket: allows bursts of up to `capacity` requests, then `rate` per second.
+
+    Use as `async with bucket:` around each request.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        """Initialize token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size (defaults to rate)
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last update."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every request for at least `seconds`, e.g. after a 429.
+
+        Args:
+            seconds: Time to wait before the next token is handed out
+        """
+        self._refill()
+        self._tokens = min(self._tokens, 1 - seconds * self.rate)
+
+    async def __aenter__(self) -> "TokenBucket":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+
+def retry_delay(
+    attempt: int,
+    headers: httpx.Headers | None = None,
+    base: float = 0.5,
+    cap: float = 30.0,
+) -> float:
+    """Seconds to wait before retrying a rate-limited or failed request.
+
+    Uses the server's reset hint (Retry-After, or ByBit's
+    X-Bapi-Limit-Reset-Timestamp) when present, otherwise exponential
+    backoff with full jitter.
+
+    Args:
+        attempt: Zero-based retry attempt
+        headers: Response headers, if the request got a response
+        base: Backoff base in seconds
+        cap: Maximum delay in seconds
+
+    Returns:
+        Delay in seconds
+    """
+    headers = headers or httpx.Headers()
+    try:
+        if "Retry-After" in headers:
+            return min(float(headers["Retry-After"]), cap)
+        if "X-Bapi-Limit-Reset-Timestamp" in headers:
+            reset_ms = int(headers["X-Bapi-Limit-Reset-Timestamp"])
+            return min(max(reset_ms / 1000 - time.time(), 0.0), cap)
+    except ValueError:
+        pass
+    return random.uniform(0, min(cap, base * 2**attempt))
@@ -0,0 +1,406 @@
+"""Shared HTTP plumbing for REST exchange connectors."""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator
+
+import httpx
+import numpy as np
+import orjson
+
+from src.connectors.base import ExchangeConnector, Kline, KlineBatch, MarketType
+from src.connectors.ratelimit import TokenBucket, retry_delay
+
+
+def _parse_candles(
+    rows: list[list], start_ms: int | None
+) -> tuple[np.ndarray, np.ndarray]:
+    """Decode raw candle pages column-wise.
+
+    Args:
+        rows: Raw [open time, open, high, low, close, volume, quote volume, ...]
+            rows, in any order
+        start_ms: Rows opening before this epoch ms are dropped
+
+    Returns:
+        Tuple of (open times in ms, float64 array of open/high/low/close/volume/
+        quote_volume rows), deduplicated on open time in chronological order
+    """
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.empty((0, 6))
+    arr = np.array(rows, dtype=object)
+    # np.unique sorts and keeps one row per open time
+    open_times, first = np.unique(arr[:, 0].astype(np.int64), return_index=True)
+    values = np.zeros((len(first), 6))
+    # The quote volume is missing from some responses; it stays 0.0 then
+    n_cols = min(arr.shape[1] - 1, 6)
+    values[:, :n_cols] = arr[first, 1 : n_cols + 1].astype(np.float64)
+    if start_ms is not None:
+        mask = open_times >= start_ms
+        open_times, values = open_times[mask], values[mask]
+    return open_times, values
+
+
+class RestConnector(ExchangeConnector):
+    """Connector talking to a REST API through a shared client and rate limiter.
+
+    Subclasses set the limits below and, when the API wraps its responses in
+    an envelope, override _decode.
+    """
+
+    MAX_CONCURRENT_REQUESTS = 8
+    REQUESTS_PER_SECOND: float = 10
+    MAX_RETRIES = 5
+    # HTTP statuses that mean "slow down" rather than failure
+    RATE_LIMIT_STATUSES = frozenset({429})
+
+    def __init__(
+        self,
+        max_connections: int = 1000,
+        max_keepalive_connections: int = 100,
+        keepalive_expiry: float = 75.0,
+        retries: int = 2,
+    ):
+        """Initialize the HTTP client and rate limiter.
+
+        Args:
+            max_connections: Connection pool size
+            max_keepalive_connections: Idle connections kept open for reuse
+            keepalive_expiry: Seconds an idle connection is kept open
+            retries: Retries on connection errors (not on HTTP error statuses)
+        """
+        # HTTP/2 multiplexing and keep-alive so successive pages reuse one
+        # TLS connection. With a custom transport, http2/limits go on the
+        # transport rather than the client.
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                    keepalive_expiry=keepalive_expiry,
+                ),
+                retries=retries,
+            ),
+        )
+        self._limiter = TokenBucket(self.REQUESTS_PER_SECOND)
+        self._semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+
+    async def close(self) -> None:
+        """Close HTTP client."""
+        await self._client.aclose()
+
+    def _decode(self, resp: httpx.Response, error_prefix: str) -> Any | None:
+        """Decode a response that is neither a 5xx nor a rate-limit status.
+
+        Args:
+            resp: HTTP response
+            error_prefix: Prefix for the RuntimeError raised on API errors
+
+        Returns:
+            Decoded JSON, or None if the body reports a rate limit
+        """
+        try:
+            resp.raise_for_status()
+        except httpx.HTTPError as e:
+            raise RuntimeError(f"{error_prefix}: {e}") from e
+        return orjson.loads(resp.content)
+
+    async def _get_json(self, url: str, params: dict, error_prefix: str) -> Any:
+        """GET an endpoint through the rate limiter.
+
+        Rate-limited responses are retried up to MAX_RETRIES times, holding
+        back the limiter until the reset time the server reports. Transport
+        errors (timeouts, dropped connections) and 5xx responses are retried
+        too, after an exponential backoff with jitter.
+
+        Args:
+            url: Full endpoint URL
+            params: Query parameters
+            error_prefix: Prefix for the RuntimeError raised on failure
+
+        Returns:
+            Decoded JSON response
+        """
+        error = ""
+        for attempt in range(self.MAX_RETRIES + 1):
+            async with self._semaphore, self._limiter:
+                try:
+                    resp = await self._client.get(url, params=params)
+                except httpx.TransportError as e:
+                    error = str(e) or type(e).__name__
+                    resp = None
+                except httpx.HTTPError as e:
+                    raise RuntimeError(f"{error_prefix}: {e}") from e
+
+            # Transient failures back off locally; rate limits hold back every request
+            if resp is None or resp.status_code >= 500:
+                if resp is not None:
+                    error = f"HTTP {resp.status_code}"
+                if attempt < self.MAX_RETRIES:
+                    await asyncio.sleep(retry_delay(attempt))
+                continue
+
+            if resp.status_code not in self.RATE_LIMIT_STATUSES:
+                data = self._decode(resp, error_prefix)
+                if data is not None:
+                    return data
+            error = "rate limited"
+            self._limiter.pause(retry_delay(attempt, resp.headers))
+
+        raise RuntimeError(f"{error_prefix}: {error} after {self.MAX_RETRIES} retries")
+
+
+class WindowedKlineConnector(RestConnector):
+    """REST connector whose candle endpoint pages backwards from an end time.
+
+    Subclasses describe the endpoint in _kline_request, _time_params and
+    _candle_rows; the windowing, paging and batching are shared.
+    """
+
+    KLINE_LIMIT = 1000
+    INTERVAL_MS = {"1h": 3_600_000, "4h": 14_400_000, "1d": 86_400_000}
+    API_ERROR = "API error"
+
+    def _kline_request(
+        self, symbol: str, interval: str, market_type: MarketType
+    ) -> tuple[str, dict, int]:
+        """Describe the candle request for a symbol and market.
+
+        Args:
+            symbol: Trading pair symbol
+            interval: Kline interval (1h, 4h, 1d)
+            market_type: Spot or perpetual
+
+        Returns:
+            Tuple of (endpoint URL, base query parameters, rows in a full page)
+        """
+        raise NotImplementedError
+
+    def _time_params(self, start_ms: int | None, end_ms: int | None) -> dict:
+        """Query parameters bounding a candle request.
+
+        Args:
+            start_ms: Window start in ms (None = unbounded)
+            end_ms: Window end in ms (None = unbounded)
+
+        Returns:
+            Parameters for the bounds that are set
+        """
+        raise NotImplementedError
+
+    def _candle_rows(self, data: Any) -> list[list]:
+        """Extract the raw candle rows from a decoded candle response.
+
+        Args:
+            data: Decoded JSON response
+
+        Returns:
+            Raw candle rows
+        """
+        raise NotImplementedError
+
+    def _build_windows(
+        self,
+        start_time: datetime,
+        end_time: datetime | None,
+        interval: str,
+        page_size: int,
+    ) -> list[tuple[int, int]]:
+        """Split a time range into windows that each fit in one page.
+
+        Args:
+            start_time: Start of range
+            end_time: End of range (None = now)
+            interval: Kline interval (1h, 4h, 1d)
+            page_size: Candles per page
+
+        Returns:
+            Inclusive (start_ms, end_ms) windows in chronological order
+        """
+        start_ms = int(start_time.timestamp() * 1000)
+        end_ms = int((end_time or datetime.now(tz=timezone.utc)).timestamp() * 1000)
+        step_ms = page_size * self.INTERVAL_MS.get(interval, self.INTERVAL_MS["1h"])
+        return [
+            (window_start, min(window_start + step_ms - 1, end_ms))
+            for window_start in range(start_ms, end_ms + 1, step_ms)
+        ]
+
+    async def _kline_pages(
+        self,
+        url: str,
+        params: dict,
+        page_limit: int,
+        start_ms: int | None,
+        end_ms: int | None,
+    ) -> AsyncIterator[list[list]]:
+        """Page through a window backwards from its end.
+
+        Args:
+            url: Candle endpoint URL
+            params: Base query parameters
+            page_limit: Rows in a full page
+            start_ms: Window start in ms (None = earliest available)
+            end_ms: Window end in ms (None = now)
+
+        Yields:
+            Non-empty pages of raw candle rows, newest page first
+        """
+        params = {**params, **self._time_params(start_ms, end_ms)}
+
+        while True:
+            data = await self._get_json(url, params, self.API_ERROR)
+            kline_list = self._candle_rows(data)
+
+            if kline_list:
+                yield kline_list
+            if len(kline_list) < page_limit:
+                return
+
+            # Move end time backwards; pages may be newest or oldest first
+            earliest_time = min(int(kline_list[0][0]), int(kline_list[-1][0]))
+            if start_ms is not None and earliest_time <= start_ms:
+                return
+            params.update(self._time_params(None, earliest_time - 1))
+
+    async def _fetch_kline_window(
+        self,
+        url: str,
+        params: dict,
+        page_limit: int,
+        start_ms: int | None,
+        end_ms: int | None,
+    ) -> list[list]:
+        """Fetch every candle in a window.
+
+        Args:
+            url: Candle endpoint URL
+            params: Base query parameters
+            page_limit: Rows in a full page
+            start_ms: Window start in ms (None = earliest available)
+            end_ms: Window end in ms (None = now)
+
+        Returns:
+            Raw candle rows
+        """
+        return [
+            row
+            async for page in self._kline_pages(url, params, page_limit, start_ms, end_ms)
+            for row in page
+        ]
+
+    def _make_batch(
+        self,
+        rows: list[list],
+        start_ms: int | None,
+        symbol: str,
+        interval: str,
+        market_type: MarketType,
+    ) -> KlineBatch | None:
+        """Decode raw candle rows into a batch.
+
+        Args:
+            rows: Raw candle rows
+            start_ms: Rows opening before this epoch ms are dropped
+            symbol: Trading pair symbol
+            interval: Kline interval
+            market_type: Spot or perpetual
+
+        Returns:
+            KlineBatch in chronological order, or None if no rows remain
+        """
+        open_times, values = _parse_candles(rows, start_ms)
+        if not len(open_times):
+            return None
+        return KlineBatch(
+            exchange=self.name,
+            market_type=market_type,
+            symbol=symbol,
+            interval=interval,
+            open_time=open_times,
+            open=values[:, 0],
+            high=values[:, 1],
+            low=values[:, 2],
+            close=values[:, 3],
+            volume=values[:, 4],
+            quote_volume=values[:, 5],
+        )
+
+    async def fetch_kline_batches(
+        self,
+        symbol: str,
+        interval: str,
+        market_type: MarketType,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+    ) -> AsyncIterator[KlineBatch]:
+        """Fetch historical klines as column-oriented batches, one per page.
+
+        With a start_time, the range is split into page-sized windows that
+        are fetched concurrently (up to MAX_CONCURRENT_REQUESTS at a time)
+        and yielded in chronological order as each completes. Without one,
+        pages are walked backwards from end_time until the data runs out and
+        yielded as they arrive, newest page first.
+
+        Args:
+            symbol: Trading pair symbol
+            interval: Kline interval (1h, 4h, 1d)
+            market_type: Spot or perpetual
+            start_time: Start of range
+            end_time: End of range
+
+        Yields:
+            KlineBatch objects, each in chronological order
+        """
+        url, params, page_limit = self._kline_request(symbol, interval, market_type)
+        end_ms = int(end_time.timestamp() * 1000) if end_time else None
+
+        if start_time is None:
+            async for page in self._kline_pages(url, params, page_limit, None, end_ms):
+                batch = self._make_batch(page, None, symbol, interval, market_type)
+                if batch is not None:
+                    yield batch
+            return
+
+        start_ms = int(start_time.timestamp() * 1000)
+        windows = self._build_windows(start_time, end_time, interval, page_limit)
+        tasks = [
+            asyncio.ensure_future(self._fetch_kline_window(url, params, page_limit, lo, hi))
+            for lo, hi in windows
+        ]
+        try:
+            for task in tasks:
+                batch = self._make_batch(await task, start_ms, symbol, interval, market_type)
+                if batch is not None:
+                    yield batch
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def fetch_klines(
+        self,
+        symbol: str,
+        interval: str,
+        market_type: MarketType,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+    ) -> AsyncIterator[Kline]:
+        """Fetch historical klines with pagination.
+
+        Args:
+            symbol: Trading pair symbol
+            interval: Kline interval (1h, 4h, 1d)
+            market_type: Spot or perpetual
+            start_time: Start of range
+            end_time: End of range
+
+        Yields:
+            Kline objects, in the page order of fetch_kline_batches
+        """
+        async for batch in self.fetch_kline_batches(
+            symbol, interval, market_type, start_time, end_time
+        ):
+            for kline in batch.to_klines():
+                yield kline
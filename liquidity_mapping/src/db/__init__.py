@@ -1,13 +1,16 @@
 """Database models and repository."""
 
-from src.db.engine import get_engine, init_db
+from src.db.engine import archive_db, get_engine, init_db, restore_db
 from src.db.models import KlineModel, OpenInterestModel
-from src.db.repository import Repository
+from src.db.repository import Repository, SymbolSummary
 
 __all__ = [
+    "archive_db",
     "get_engine",
     "init_db",
     "KlineModel",
     "OpenInterestModel",
     "Repository",
+    "restore_db",
+    "SymbolSummary",
 ]
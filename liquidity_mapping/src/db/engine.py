@@ -1,16 +1,67 @@
 """Database engine configuration."""
 
+import asyncio
+import atexit
+import os
+import shutil
+import threading
 from pathlib import Path
 
-from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy import Connection, event, text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from src.db.models import Base
 
-_engine: AsyncEngine | None = None
+try:
+    import zstandard
+except ImportError:  # optional: pip install -e ".[archive]"
+    zstandard = None
+
+# One engine per event loop: pooled aiosqlite connections are bound to the
+# loop that opened them and break when reused from another loop
+_engines: dict[int, AsyncEngine] = {}
+_session_factories: dict[int, async_sessionmaker[AsyncSession]] = {}
+_engines_lock = threading.Lock()
+
+# Applied to every new connection. page_size only takes effect on a new,
+# empty database, so it must come before journal_mode writes the header.
+# WAL + synchronous=NORMAL avoids an fsync per commit. The mmap window (bytes)
+# is shared through the OS page cache; cache_size (KiB when negative) is per
+# connection, so it stays moderate across the pool.
+_SQLITE_PRAGMAS = (
+    "PRAGMA page_size=8192",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=1073741824",
+    "PRAGMA cache_size=-65536",
+)
+
+
+def _set_sqlite_pragmas(dbapi_conn, connection_record) -> None:
+    """Configure a new SQLite connection for write throughput."""
+    cursor = dbapi_conn.cursor()
+    for pragma in _SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def _loop_key() -> int:
+    """Key of the running event loop (0 when called outside of one)."""
+    try:
+        return id(asyncio.get_running_loop())
+    except RuntimeError:
+        return 0
 
 
 def get_engine(db_path: Path | None = None) -> AsyncEngine:
-    """Get or create the async database engine.
+    """Get or create the async database engine for the running event loop.
 
     Args:
         db_path: Path to SQLite database file. Defaults to liquidity.db in cwd.
@@ -18,15 +69,108 @@ def get_engine(db_path: Path | None = None) -> AsyncEngine:
     Returns:
         AsyncEngine instance
     """
-    global _engine
-    if _engine is None:
-        if db_path is None:
-            db_path = Path.cwd() / "liquidity.db"
-        _engine = create_async_engine(
-            f"sqlite+aiosqlite:///{db_path}",
-            echo=False,
-        )
-    return _engine
+    key = _loop_key()
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            if db_path is None:
+                db_path = Path.cwd() / "liquidity.db"
+            # A fixed set of long-lived connections handed out LIFO, so queries
+            # land on the connection whose page cache is warmest. Local SQLite
+            # connections do not go stale, so they are never recycled or pinged.
+            engine = create_async_engine(
+                f"sqlite+aiosqlite:///{db_path}",
+                echo=False,
+                connect_args={"timeout": 30},
+                poolclass=AsyncAdaptedQueuePool,
+                pool_size=8,
+                max_overflow=0,
+                pool_recycle=-1,
+                pool_pre_ping=False,
+                pool_use_lifo=True,
+            )
+            event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+            _engines[key] = engine
+    return engine
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Get the session factory bound to the running loop's engine.
+
+    Built once per engine, so every Repository shares one factory and pool.
+
+    Returns:
+        async_sessionmaker for get_engine()
+    """
+    engine = get_engine()
+    key = _loop_key()
+    with _engines_lock:
+        factory = _session_factories.get(key)
+        if factory is None or factory.kw["bind"] is not engine:
+            factory = async_sessionmaker(engine, expire_on_commit=False)
+            _session_factories[key] = factory
+    return factory
+
+
+# Time columns that older databases stored as DATETIME text
+_TIME_COLUMNS = {
+    "klines": "open_time",
+    "open_interest": "timestamp",
+    "funding_rates": "funding_time",
+}
+
+
+def _migrate_time_columns(conn: Connection, tables: list[str]) -> None:
+    """Convert DATETIME text timestamps from older databases to epoch ms in place.
+
+    Args:
+        conn: Synchronous connection inside a transaction
+        tables: Names of the tables copied over from an older schema
+    """
+    for table in tables:
+        column = _TIME_COLUMNS[table]
+        # %s is whole seconds, %f is "SS.SSS"; together they give exact ms
+        conn.execute(text(
+            f"UPDATE {table} SET {column} = "
+            f"CAST(strftime('%s', {column}) AS INTEGER) * 1000"
+            f" + CAST(substr(strftime('%f', {column}), 4) AS INTEGER)"
+            f" WHERE typeof({column}) = 'text'"
+        ))
+
+
+def _create_tables(conn: Connection) -> None:
+    """Create tables, rebuilding any left over from older schema versions.
+
+    Tables from before the WITHOUT ROWID layout still have an `id` column.
+    They are renamed, recreated from the models, copied across and dropped.
+
+    Args:
+        conn: Synchronous connection inside a transaction
+    """
+    legacy = []
+    for table in Base.metadata.sorted_tables:
+        columns = {row[1] for row in conn.execute(text(f"PRAGMA table_info({table.name})"))}
+        if "id" in columns:
+            conn.execute(text(f"ALTER TABLE {table.name} RENAME TO {table.name}_legacy"))
+            legacy.append(table)
+
+    Base.metadata.create_all(conn)
+    # create_all only indexes tables it creates; add indexes new to the models
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+    for table in legacy:
+        names = ", ".join(column.name for column in table.columns)
+        conn.execute(text(
+            f"INSERT OR IGNORE INTO {table.name} ({names}) "
+            f"SELECT {names} FROM {table.name}_legacy"
+        ))
+        conn.execute(text(f"DROP TABLE {table.name}_legacy"))
+
+    # Only tables from before the epoch-ms schema can hold text timestamps,
+    # and those are exactly the ones rebuilt above
+    _migrate_time_columns(conn, [table.name for table in legacy])
 
 
 async def init_db(engine: AsyncEngine | None = None) -> None:
@@ -38,12 +182,79 @@ async def init_db(engine: AsyncEngine | None = None) -> None:
     if engine is None:
         engine = get_engine()
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_create_tables)
+
+
+async def archive_db(dest: Path, compress: bool = True, engine: AsyncEngine | None = None) -> Path:
+    """Write a compacted copy of the database, optionally zstd-compressed.
+
+    Uses VACUUM INTO, so the copy is defragmented and consistent while the
+    live database stays usable. With compress=True and zstandard installed,
+    the copy is compressed to `<dest>.zst` and the uncompressed file removed.
+
+    Args:
+        dest: Path of the copy; must not exist yet
+        compress: Compress the copy with zstd when zstandard is available
+        engine: Optional engine to use. Defaults to global engine.
+
+    Returns:
+        Path of the written archive
+    """
+    if engine is None:
+        engine = get_engine()
+    dest = Path(dest)
+    async with engine.connect() as conn:
+        await conn.execute(text("VACUUM INTO :dest"), {"dest": str(dest)})
+
+    if not compress or zstandard is None:
+        return dest
+
+    compressed = dest.with_name(dest.name + ".zst")
+    tmp_path = compressed.with_name(compressed.name + ".tmp")
+    with dest.open("rb") as src, tmp_path.open("wb") as out:
+        zstandard.ZstdCompressor(level=19, threads=-1).copy_stream(src, out)
+    os.replace(tmp_path, compressed)
+    dest.unlink()
+    return compressed
+
+
+def restore_db(archive: Path, dest: Path) -> Path:
+    """Unpack an archive written by archive_db.
+
+    Args:
+        archive: Archive path (.zst files need zstandard installed)
+        dest: Path of the restored database
+
+    Returns:
+        Path of the restored database
+    """
+    archive = Path(archive)
+    if archive.suffix != ".zst":
+        shutil.copyfile(archive, dest)
+        return Path(dest)
+    if zstandard is None:
+        raise RuntimeError("zstandard is required to restore .zst archives")
+    with archive.open("rb") as src, Path(dest).open("wb") as out:
+        zstandard.ZstdDecompressor().copy_stream(src, out)
+    return Path(dest)
 
 
 async def close_db() -> None:
-    """Close the database engine."""
-    global _engine
-    if _engine is not None:
-        await _engine.dispose()
-        _engine = None
+    """Close all database engines."""
+    with _engines_lock:
+        engines = list(_engines.values())
+        _engines.clear()
+        _session_factories.clear()
+    for engine in engines:
+        await engine.dispose()
+
+
+@atexit.register
+def _dispose_orphaned_engines() -> None:
+    """Drop pools of engines that were never closed, without awaiting their loops."""
+    with _engines_lock:
+        engines = list(_engines.values())
+        _engines.clear()
+        _session_factories.clear()
+    for engine in engines:
+        engine.sync_engine.dispose(close=False)
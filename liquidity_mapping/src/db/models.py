@@ -1,10 +1,38 @@
 """SQLAlchemy models for kline and open interest data."""
 
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import DateTime, Float, Index, String, UniqueConstraint
+from sqlalchemy import BigInteger, Float, Index, PrimaryKeyConstraint, String
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
+_EPOCH = datetime(1970, 1, 1)
+
+
+def to_ms(dt: datetime) -> int:
+    """Convert a datetime to epoch milliseconds, as stored in the database.
+
+    Args:
+        dt: Datetime; naive values are taken to be UTC
+
+    Returns:
+        Milliseconds since the Unix epoch
+    """
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return (dt - _EPOCH) // timedelta(milliseconds=1)
+
+
+def from_ms(ms: int) -> datetime:
+    """Convert stored epoch milliseconds back to a naive UTC datetime.
+
+    Args:
+        ms: Milliseconds since the Unix epoch
+
+    Returns:
+        Naive datetime in UTC
+    """
+    return _EPOCH + timedelta(milliseconds=ms)
+
 
 class Base(DeclarativeBase):
     """Base class for all models."""
@@ -13,16 +41,19 @@ class Base(DeclarativeBase):
 
 
 class KlineModel(Base):
-    """Kline (candlestick) data model."""
+    """Kline (candlestick) data model.
+
+    The natural key is the primary key of a WITHOUT ROWID table, so rows are
+    stored in lookup order and no separate unique index is maintained.
+    """
 
     __tablename__ = "klines"
 
-    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     exchange: Mapped[str] = mapped_column(String(20), nullable=False)
     market_type: Mapped[str] = mapped_column(String(10), nullable=False)
     symbol: Mapped[str] = mapped_column(String(20), nullable=False)
     interval: Mapped[str] = mapped_column(String(5), nullable=False)
-    open_time: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    open_time: Mapped[int] = mapped_column(BigInteger, nullable=False)  # epoch ms
     open: Mapped[float] = mapped_column(Float, nullable=False)
     high: Mapped[float] = mapped_column(Float, nullable=False)
     low: Mapped[float] = mapped_column(Float, nullable=False)
@@ -31,50 +62,61 @@ class KlineModel(Base):
     quote_volume: Mapped[float] = mapped_column(Float, nullable=False)
 
     __table_args__ = (
-        UniqueConstraint(
-            "exchange", "market_type", "symbol", "interval", "open_time",
-            name="uq_kline"
+        PrimaryKeyConstraint(
+            "symbol", "exchange", "market_type", "interval", "open_time",
+            name="pk_kline",
         ),
-        Index("ix_kline_lookup", "symbol", "exchange", "market_type", "interval", "open_time"),
+        # Cross-exchange range scans (symbol + interval, ordered by time)
+        Index("ix_klines_sym_int_time", "symbol", "interval", "open_time"),
+        {"sqlite_with_rowid": False},
     )
 
+    @property
+    def open_time_dt(self) -> datetime:
+        """Open time as a naive UTC datetime."""
+        return from_ms(self.open_time)
+
 
 class OpenInterestModel(Base):
-    """Open interest snapshot model."""
+    """Open interest snapshot model (WITHOUT ROWID, keyed like KlineModel)."""
 
     __tablename__ = "open_interest"
 
-    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     exchange: Mapped[str] = mapped_column(String(20), nullable=False)
     symbol: Mapped[str] = mapped_column(String(20), nullable=False)
-    timestamp: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    timestamp: Mapped[int] = mapped_column(BigInteger, nullable=False)  # epoch ms
     open_interest: Mapped[float] = mapped_column(Float, nullable=False)
     open_interest_value: Mapped[float] = mapped_column(Float, nullable=False)
 
     __table_args__ = (
-        UniqueConstraint(
-            "exchange", "symbol", "timestamp",
-            name="uq_open_interest"
-        ),
-        Index("ix_oi_lookup", "symbol", "exchange", "timestamp"),
+        PrimaryKeyConstraint("symbol", "exchange", "timestamp", name="pk_open_interest"),
+        Index("ix_oi_sym_ts", "symbol", "timestamp"),
+        {"sqlite_with_rowid": False},
     )
 
+    @property
+    def timestamp_dt(self) -> datetime:
+        """Snapshot time as a naive UTC datetime."""
+        return from_ms(self.timestamp)
+
 
 class FundingRateModel(Base):
-    """Funding rate data model for perpetual contracts."""
+    """Funding rate data model for perpetual contracts (WITHOUT ROWID)."""
 
     __tablename__ = "funding_rates"
 
-    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     exchange: Mapped[str] = mapped_column(String(20), nullable=False)
     symbol: Mapped[str] = mapped_column(String(20), nullable=False)
-    funding_time: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    funding_time: Mapped[int] = mapped_column(BigInteger, nullable=False)  # epoch ms
     funding_rate: Mapped[float] = mapped_column(Float, nullable=False)
 
     __table_args__ = (
-        UniqueConstraint(
-            "exchange", "symbol", "funding_time",
-            name="uq_funding_rate"
-        ),
-        Index("ix_funding_lookup", "symbol", "exchange", "funding_time"),
+        PrimaryKeyConstraint("symbol", "exchange", "funding_time", name="pk_funding_rate"),
+        Index("ix_fr_sym_time", "symbol", "funding_time"),
+        {"sqlite_with_rowid": False},
     )
+
+    @property
+    def funding_time_dt(self) -> datetime:
+        """Funding time as a naive UTC datetime."""
+        return from_ms(self.funding_time)
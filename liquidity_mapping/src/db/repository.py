@@ -1,14 +1,48 @@
 """Repository for storing and retrieving market data."""
 
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from datetime import datetime
+from itertools import repeat
+from typing import AsyncIterator
 
-from sqlalchemy import select, func
-from sqlalchemy.dialects.sqlite import insert
+import numpy as np
+from sqlalchemy import Select, Table, func, literal, null, select, union_all
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from src.connectors.base import FundingRate, Kline, MarketType, OpenInterest
-from src.db.engine import get_engine
-from src.db.models import FundingRateModel, KlineModel, OpenInterestModel
+from src.connectors.base import FundingRate, Kline, KlineBatch, MarketType, OpenInterest
+from src.db.engine import get_session_factory
+from src.db.models import FundingRateModel, KlineModel, OpenInterestModel, from_ms, to_ms
+
+# Columns returned by Repository.get_kline_columns, with their array dtypes
+KLINE_COLUMN_DTYPES = {
+    "exchange": object,
+    "market_type": object,
+    "open_time": np.int64,  # epoch ms
+    "open": np.float64,
+    "high": np.float64,
+    "low": np.float64,
+    "close": np.float64,
+    "volume": np.float64,
+    "quote_volume": np.float64,
+}
+
+
+@dataclass
+class SymbolSummary:
+    """Stored data for one symbol, as shown after a fetch."""
+
+    kline_count: int
+    oi_count: int
+    funding_count: int
+    earliest: datetime | None
+    latest: datetime | None
+    exchange_ranges: dict[str, tuple[datetime, datetime]]  # exchange -> kline range
+
+    @property
+    def exchanges(self) -> dict[str, bool]:
+        """Exchanges with klines for the symbol."""
+        return {exchange: True for exchange in self.exchange_ranges}
 
 
 class Repository:
@@ -18,18 +52,39 @@ class Repository:
         """Initialize repository.
 
         Args:
-            session_factory: Optional session factory. Creates one if not provided.
+            session_factory: Optional session factory. Defaults to the shared
+                factory for the current engine.
         """
-        if session_factory is None:
-            engine = get_engine()
-            session_factory = async_sessionmaker(engine, expire_on_commit=False)
-        self._session_factory = session_factory
+        self._session_factory = session_factory or get_session_factory()
+        # Bumped on every write; cached summaries from older versions are stale
+        self._version = 0
+        self._summary_cache: dict[str, tuple[int, SymbolSummary]] = {}
 
-    async def upsert_klines(self, klines: list[Kline]) -> int:
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[AsyncSession]:
+        """Open a session whose writes are committed together on exit.
+
+        Pass the session to the upsert methods to group many batches into one
+        commit; it is rolled back if the block raises.
+
+        Yields:
+            AsyncSession inside an open transaction
+        """
+        try:
+            async with self._session_factory() as session, session.begin():
+                yield session
+        finally:
+            # Writes only become visible to other sessions at commit
+            self._version += 1
+
+    async def upsert_klines(
+        self, klines: list[Kline], session: AsyncSession | None = None
+    ) -> int:
         """Insert or update klines with deduplication.
 
         Args:
             klines: List of Kline objects to store
+            session: Session from transaction(); commits immediately if omitted
 
         Returns:
             Number of rows affected
@@ -37,44 +92,92 @@ class Repository:
         if not klines:
             return 0
 
-        async with self._session_factory() as session:
-            rows = [
-                {
-                    "exchange": k.exchange,
-                    "market_type": k.market_type.value,
-                    "symbol": k.symbol,
-                    "interval": k.interval,
-                    "open_time": k.open_time,
-                    "open": k.open,
-                    "high": k.high,
-                    "low": k.low,
-                    "close": k.close,
-                    "volume": k.volume,
-                    "quote_volume": k.quote_volume,
-                }
-                for k in klines
-            ]
-            stmt = insert(KlineModel).values(rows)
-            stmt = stmt.on_conflict_do_update(
-                index_elements=["exchange", "market_type", "symbol", "interval", "open_time"],
-                set_={
-                    "open": stmt.excluded.open,
-                    "high": stmt.excluded.high,
-                    "low": stmt.excluded.low,
-                    "close": stmt.excluded.close,
-                    "volume": stmt.excluded.volume,
-                    "quote_volume": stmt.excluded.quote_volume,
-                },
+        rows = [
+            (
+                k.exchange,
+                k.market_type.value,
+                k.symbol,
+                k.interval,
+                to_ms(k.open_time),
+                k.open,
+                k.high,
+                k.low,
+                k.close,
+                k.volume,
+                k.quote_volume,
             )
-            result = await session.execute(stmt)
-            await session.commit()
+            for k in klines
+        ]
+        return await self._executemany(_KLINE_UPSERT, rows, session)
+
+    async def upsert_kline_batch(
+        self, batch: KlineBatch, session: AsyncSession | None = None
+    ) -> int:
+        """Insert or update a column-oriented batch of klines.
+
+        Row tuples are zipped straight from the batch arrays and sent as one
+        executemany, without building Kline objects.
+
+        Args:
+            batch: KlineBatch to store
+            session: Session from transaction(); commits immediately if omitted
+
+        Returns:
+            Number of rows affected
+        """
+        if not len(batch):
+            return 0
+
+        n = len(batch)
+        rows = list(zip(
+            repeat(batch.exchange, n),
+            repeat(batch.market_type.value, n),
+            repeat(batch.symbol, n),
+            repeat(batch.interval, n),
+            batch.open_time.tolist(),
+            batch.open.tolist(),
+            batch.high.tolist(),
+            batch.low.tolist(),
+            batch.close.tolist(),
+            batch.volume.tolist(),
+            batch.quote_volume.tolist(),
+        ))
+        return await self._executemany(_KLINE_UPSERT, rows, session)
+
+    async def _executemany(
+        self, sql: str, rows: list[tuple], session: AsyncSession | None = None
+    ) -> int:
+        """Run a positional upsert once per row as a single executemany.
+
+        The SQL goes straight to the driver, so SQLite prepares it once and
+        binds each tuple without SQLAlchemy compiling or naming parameters.
+
+        Args:
+            sql: Statement with ? placeholders, e.g. _KLINE_UPSERT
+            rows: Parameter tuples in table column order
+            session: Session from transaction(); a new session is opened and
+                committed if omitted
+
+        Returns:
+            Number of rows affected
+        """
+        if session is not None:
+            self._version += 1
+            conn = await session.connection()
+            result = await conn.exec_driver_sql(sql, rows)
             return result.rowcount
 
-    async def upsert_open_interest(self, oi_data: list[OpenInterest]) -> int:
+        async with self.transaction() as session:
+            return await self._executemany(sql, rows, session)
+
+    async def upsert_open_interest(
+        self, oi_data: list[OpenInterest], session: AsyncSession | None = None
+    ) -> int:
         """Insert or update open interest with deduplication.
 
         Args:
             oi_data: List of OpenInterest objects to store
+            session: Session from transaction(); commits immediately if omitted
 
         Returns:
             Number of rows affected
@@ -82,28 +185,17 @@ class Repository:
         if not oi_data:
             return 0
 
-        async with self._session_factory() as session:
-            rows = [
-                {
-                    "exchange": oi.exchange,
-                    "symbol": oi.symbol,
-                    "timestamp": oi.timestamp,
-                    "open_interest": oi.open_interest,
-                    "open_interest_value": oi.open_interest_value,
-                }
-                for oi in oi_data
-            ]
-            stmt = insert(OpenInterestModel).values(rows)
-            stmt = stmt.on_conflict_do_update(
-                index_elements=["exchange", "symbol", "timestamp"],
-                set_={
-                    "open_interest": stmt.excluded.open_interest,
-                    "open_interest_value": stmt.excluded.open_interest_value,
-                },
+        rows = [
+            (
+                oi.exchange,
+                oi.symbol,
+                to_ms(oi.timestamp),
+                oi.open_interest,
+                oi.open_interest_value,
             )
-            result = await session.execute(stmt)
-            await session.commit()
-            return result.rowcount
+            for oi in oi_data
+        ]
+        return await self._executemany(_OPEN_INTEREST_UPSERT, rows, session)
 
     async def get_klines(
         self,
@@ -127,23 +219,56 @@ class Repository:
         Returns:
             List of KlineModel objects
         """
+        stmt = _klines_query(symbol, interval, exchange, market_type, start_time, end_time)
         async with self._session_factory() as session:
-            stmt = select(KlineModel).where(
-                KlineModel.symbol == symbol,
-                KlineModel.interval == interval,
-            )
-            if exchange:
-                stmt = stmt.where(KlineModel.exchange == exchange)
-            if market_type:
-                stmt = stmt.where(KlineModel.market_type == market_type.value)
-            if start_time:
-                stmt = stmt.where(KlineModel.open_time >= start_time)
-            if end_time:
-                stmt = stmt.where(KlineModel.open_time <= end_time)
-            stmt = stmt.order_by(KlineModel.open_time)
             result = await session.execute(stmt)
             return list(result.scalars().all())
 
+    async def get_kline_columns(
+        self,
+        symbol: str,
+        interval: str = "1h",
+        exchange: str | None = None,
+        market_type: MarketType | None = None,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+        chunk_size: int = 10_000,
+    ) -> dict[str, np.ndarray]:
+        """Retrieve klines as one numpy array per column, bypassing the ORM.
+
+        Plain row tuples are streamed in chunks and transposed into arrays,
+        so no KlineModel objects are built.
+
+        Args:
+            symbol: Trading pair symbol
+            interval: Kline interval
+            exchange: Optional exchange filter
+            market_type: Optional market type filter
+            start_time: Optional start time filter
+            end_time: Optional end time filter
+            chunk_size: Rows fetched per chunk
+
+        Returns:
+            Dict of column name -> array in open_time order, with the dtypes in
+            KLINE_COLUMN_DTYPES (open_time as epoch ms). Arrays are empty if
+            nothing matches.
+        """
+        stmt = _klines_query(symbol, interval, exchange, market_type, start_time, end_time)
+        stmt = stmt.with_only_columns(
+            *(KlineModel.__table__.c[name] for name in KLINE_COLUMN_DTYPES)
+        )
+        chunks: dict[str, list[np.ndarray]] = {name: [] for name in KLINE_COLUMN_DTYPES}
+        async with self._session_factory() as session:
+            conn = await session.connection()
+            result = await conn.stream(stmt.execution_options(yield_per=chunk_size))
+            async for partition in result.partitions():
+                for (name, dtype), values in zip(KLINE_COLUMN_DTYPES.items(), zip(*partition)):
+                    chunks[name].append(np.array(values, dtype=dtype))
+        return {
+            name: np.concatenate(chunks[name]) if chunks[name] else np.empty(0, dtype)
+            for name, dtype in KLINE_COLUMN_DTYPES.items()
+        }
+
     async def get_open_interest(
         self,
         symbol: str,
@@ -167,100 +292,156 @@ class Repository:
             if exchange:
                 stmt = stmt.where(OpenInterestModel.exchange == exchange)
             if start_time:
-                stmt = stmt.where(OpenInterestModel.timestamp >= start_time)
+                stmt = stmt.where(OpenInterestModel.timestamp >= to_ms(start_time))
             if end_time:
-                stmt = stmt.where(OpenInterestModel.timestamp <= end_time)
+                stmt = stmt.where(OpenInterestModel.timestamp <= to_ms(end_time))
             stmt = stmt.order_by(OpenInterestModel.timestamp)
             result = await session.execute(stmt)
             return list(result.scalars().all())
 
-    async def get_available_date_range(
-        self, symbol: str
-    ) -> tuple[datetime | None, datetime | None, dict[str, bool]]:
-        """Get the available date range for a symbol.
+    async def get_last_open_time(
+        self,
+        symbol: str,
+        interval: str,
+        exchange: str,
+        market_type: MarketType,
+        offset: int = 0,
+    ) -> int | None:
+        """Get the open time of the newest stored candle of one market.
+
+        Served from the primary key, so it is a single index probe.
 
         Args:
             symbol: Trading pair symbol
+            interval: Kline interval
+            exchange: Exchange name
+            market_type: Spot or perpetual
+            offset: Number of newest candles to skip, e.g. to re-fetch a tail
 
         Returns:
-            Tuple of (earliest_date, latest_date, exchange_availability)
+            Open time in epoch ms, or None if fewer than offset + 1 candles are stored
         """
+        stmt = (
+            select(KlineModel.open_time)
+            .where(
+                KlineModel.symbol == symbol,
+                KlineModel.exchange == exchange,
+                KlineModel.market_type == market_type.value,
+                KlineModel.interval == interval,
+            )
+            .order_by(KlineModel.open_time.desc())
+            .limit(1)
+            .offset(offset)
+        )
         async with self._session_factory() as session:
-            # Get date range
-            stmt = select(
-                func.min(KlineModel.open_time),
-                func.max(KlineModel.open_time),
-            ).where(KlineModel.symbol == symbol)
-            result = await session.execute(stmt)
-            row = result.one()
-            earliest, latest = row[0], row[1]
-
-            # Get exchange availability
-            stmt = select(KlineModel.exchange).where(
-                KlineModel.symbol == symbol
-            ).distinct()
-            result = await session.execute(stmt)
-            exchanges = {row[0]: True for row in result.all()}
+            return await session.scalar(stmt)
 
-            return earliest, latest, exchanges
-
-    async def get_exchange_date_ranges(
-        self, symbol: str
-    ) -> dict[str, tuple[datetime | None, datetime | None]]:
-        """Get date ranges per exchange for a symbol.
+    async def get_last_oi_time(self, symbol: str, exchange: str) -> int | None:
+        """Get the time of the newest stored OI snapshot from one exchange.
 
         Args:
             symbol: Trading pair symbol
+            exchange: Exchange name
 
         Returns:
-            Dict of exchange -> (earliest_date, latest_date)
+            Timestamp in epoch ms, or None if nothing is stored
         """
+        stmt = select(func.max(OpenInterestModel.timestamp)).where(
+            OpenInterestModel.symbol == symbol,
+            OpenInterestModel.exchange == exchange,
+        )
         async with self._session_factory() as session:
-            stmt = select(
-                KlineModel.exchange,
-                func.min(KlineModel.open_time),
-                func.max(KlineModel.open_time),
-            ).where(KlineModel.symbol == symbol).group_by(KlineModel.exchange)
-            result = await session.execute(stmt)
-            return {row[0]: (row[1], row[2]) for row in result.all()}
+            return await session.scalar(stmt)
 
-    async def get_kline_count(self, symbol: str) -> int:
-        """Get total kline count for a symbol.
+    async def get_last_funding_time(self, symbol: str, exchange: str) -> int | None:
+        """Get the time of the newest stored funding rate from one exchange.
 
         Args:
             symbol: Trading pair symbol
+            exchange: Exchange name
 
         Returns:
-            Count of klines
+            Funding time in epoch ms, or None if nothing is stored
         """
+        stmt = select(func.max(FundingRateModel.funding_time)).where(
+            FundingRateModel.symbol == symbol,
+            FundingRateModel.exchange == exchange,
+        )
         async with self._session_factory() as session:
-            stmt = select(func.count()).select_from(KlineModel).where(
-                KlineModel.symbol == symbol
-            )
-            result = await session.execute(stmt)
-            return result.scalar() or 0
+            return await session.scalar(stmt)
+
+    async def analyze(self) -> None:
+        """Refresh SQLite's planner statistics after a bulk load."""
+        async with self._session_factory() as session:
+            conn = await session.connection()
+            await conn.exec_driver_sql("ANALYZE")
+            await session.commit()
+
+    async def get_symbol_summary(self, symbol: str) -> SymbolSummary:
+        """Get kline ranges and row counts for a symbol in one query.
 
-    async def get_oi_count(self, symbol: str) -> int:
-        """Get total OI snapshot count for a symbol.
+        Per-exchange kline ranges and counts plus the OI and funding counts
+        come back from a single UNION ALL. The result is cached until the
+        next write through this repository.
 
         Args:
             symbol: Trading pair symbol
 
         Returns:
-            Count of OI snapshots
+            SymbolSummary for the symbol
         """
+        cached = self._summary_cache.get(symbol)
+        if cached is not None and cached[0] == self._version:
+            return cached[1]
+
+        version = self._version
+        stmt = union_all(
+            select(
+                literal("klines"),
+                KlineModel.exchange,
+                func.min(KlineModel.open_time),
+                func.max(KlineModel.open_time),
+                func.count(),
+            ).where(KlineModel.symbol == symbol).group_by(KlineModel.exchange),
+            select(literal("open_interest"), null(), null(), null(), func.count())
+            .select_from(OpenInterestModel)
+            .where(OpenInterestModel.symbol == symbol),
+            select(literal("funding_rates"), null(), null(), null(), func.count())
+            .select_from(FundingRateModel)
+            .where(FundingRateModel.symbol == symbol),
+        )
         async with self._session_factory() as session:
-            stmt = select(func.count()).select_from(OpenInterestModel).where(
-                OpenInterestModel.symbol == symbol
-            )
             result = await session.execute(stmt)
-            return result.scalar() or 0
-
-    async def upsert_funding_rates(self, funding_data: list[FundingRate]) -> int:
+            rows = result.all()
+
+        counts = {"klines": 0, "open_interest": 0, "funding_rates": 0}
+        ranges: dict[str, tuple[int, int]] = {}
+        for source, exchange, earliest, latest, count in rows:
+            counts[source] += count
+            if source == "klines":
+                ranges[exchange] = (earliest, latest)
+
+        summary = SymbolSummary(
+            kline_count=counts["klines"],
+            oi_count=counts["open_interest"],
+            funding_count=counts["funding_rates"],
+            earliest=from_ms(min(lo for lo, _ in ranges.values())) if ranges else None,
+            latest=from_ms(max(hi for _, hi in ranges.values())) if ranges else None,
+            exchange_ranges={
+                exchange: (from_ms(lo), from_ms(hi)) for exchange, (lo, hi) in ranges.items()
+            },
+        )
+        self._summary_cache[symbol] = (version, summary)
+        return summary
+
+    async def upsert_funding_rates(
+        self, funding_data: list[FundingRate], session: AsyncSession | None = None
+    ) -> int:
         """Insert or update funding rates with deduplication.
 
         Args:
             funding_data: List of FundingRate objects to store
+            session: Session from transaction(); commits immediately if omitted
 
         Returns:
             Number of rows affected
@@ -268,26 +449,11 @@ class Repository:
         if not funding_data:
             return 0
 
-        async with self._session_factory() as session:
-            rows = [
-                {
-                    "exchange": fr.exchange,
-                    "symbol": fr.symbol,
-                    "funding_time": fr.funding_time,
-                    "funding_rate": fr.funding_rate,
-                }
-                for fr in funding_data
-            ]
-            stmt = insert(FundingRateModel).values(rows)
-            stmt = stmt.on_conflict_do_update(
-                index_elements=["exchange", "symbol", "funding_time"],
-                set_={
-                    "funding_rate": stmt.excluded.funding_rate,
-                },
-            )
-            result = await session.execute(stmt)
-            await session.commit()
-            return result.rowcount
+        rows = [
+            (fr.exchange, fr.symbol, to_ms(fr.funding_time), fr.funding_rate)
+            for fr in funding_data
+        ]
+        return await self._executemany(_FUNDING_RATE_UPSERT, rows, session)
 
     async def get_funding_rates(
         self,
@@ -312,25 +478,65 @@ class Repository:
             if exchange:
                 stmt = stmt.where(FundingRateModel.exchange == exchange)
             if start_time:
-                stmt = stmt.where(FundingRateModel.funding_time >= start_time)
+                stmt = stmt.where(FundingRateModel.funding_time >= to_ms(start_time))
             if end_time:
-                stmt = stmt.where(FundingRateModel.funding_time <= end_time)
+                stmt = stmt.where(FundingRateModel.funding_time <= to_ms(end_time))
             stmt = stmt.order_by(FundingRateModel.funding_time)
             result = await session.execute(stmt)
             return list(result.scalars().all())
 
-    async def get_funding_count(self, symbol: str) -> int:
-        """Get total funding rate count for a symbol.
-
-        Args:
-            symbol: Trading pair symbol
 
-        Returns:
-            Count of funding rate records
-        """
-        async with self._session_factory() as session:
-            stmt = select(func.count()).select_from(FundingRateModel).where(
-                FundingRateModel.symbol == symbol
-            )
-            result = await session.execute(stmt)
-            return result.scalar() or 0
+def _klines_query(
+    symbol: str,
+    interval: str,
+    exchange: str | None,
+    market_type: MarketType | None,
+    start_time: datetime | None,
+    end_time: datetime | None,
+) -> Select:
+    """Build the kline SELECT shared by get_klines and get_kline_columns."""
+    stmt = select(KlineModel).where(
+        KlineModel.symbol == symbol,
+        KlineModel.interval == interval,
+    )
+    if exchange:
+        stmt = stmt.where(KlineModel.exchange == exchange)
+    if market_type:
+        stmt = stmt.where(KlineModel.market_type == market_type.value)
+    if start_time:
+        stmt = stmt.where(KlineModel.open_time >= to_ms(start_time))
+    if end_time:
+        stmt = stmt.where(KlineModel.open_time <= to_ms(end_time))
+    return stmt.order_by(KlineModel.open_time)
+
+
+def _upsert_sql(table: Table) -> str:
+    """Build a positional INSERT ... ON CONFLICT DO UPDATE for a table.
+
+    Values bind in table column order; the primary key is the conflict
+    target and every other column is overwritten. Rows whose values are
+    unchanged (closed candles, past funding) are skipped by the WHERE
+    clause, so re-fetching them writes nothing to the WAL.
+
+    Args:
+        table: Table to upsert into
+
+    Returns:
+        SQL string with one ? placeholder per column
+    """
+    columns = [f'"{column.name}"' for column in table.columns]
+    keys = [f'"{column.name}"' for column in table.primary_key.columns]
+    values = [column for column in columns if column not in keys]
+    updates = [f"{column} = excluded.{column}" for column in values]
+    changed = [f"{column} IS NOT excluded.{column}" for column in values]
+    return (
+        f"INSERT INTO {table.name} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' * len(columns))}) "
+        f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {', '.join(updates)} "
+        f"WHERE {' OR '.join(changed)}"
+    )
+
+
+_KLINE_UPSERT = _upsert_sql(KlineModel.__table__)
+_OPEN_INTEREST_UPSERT = _upsert_sql(OpenInterestModel.__table__)
+_FUNDING_RATE_UPSERT = _upsert_sql(FundingRateModel.__table__)
@@ -1,24 +1,59 @@
 """Main entry point for Liquidity Mapping CLI."""
 
+import argparse
 import asyncio
 import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Coroutine, TypeVar
 
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from src.connectors import BinanceConnector, BybitConnector, BitgetConnector
-from src.connectors.base import FundingRate, Kline, MarketType, OpenInterest
-from src.db import init_db, Repository
+from src.connectors.base import ExchangeConnector, KlineBatch, MarketType
+from src.db import archive_db, init_db, Repository, restore_db
+from src.db.engine import close_db
 from src.analysis import calculate_deltas, AnalysisResult
+from src.analysis.cache import (
+    analysis_cache_path,
+    clear_symbol_cache,
+    read_cached_analysis,
+    write_cached_analysis,
+)
+from src.analysis.calculator import kline_columns_to_df
 from src.analysis.funding import get_latest_funding_stats
-from src.output import display_analysis, export_csv, export_json, export_analysis_range_csv
+from src.output import (
+    display_analysis,
+    export_analysis_range_csv,
+    export_csv,
+    export_json,
+    prepare_output,
+)
 from src.output.terminal import display_data_summary, display_funding_stats
 from src.output.plots import display_funding_plot
 from src import menu
 
+try:
+    import uvloop
+except ImportError:  # uvloop is optional (pip install -e ".[fast]", not on Windows)
+    uvloop = None
+
 
 console = Console()
 
+# Stored candles re-fetched on every fetch, in case the exchange republishes them
+REFRESH_TAIL_BARS = 10
+
+# Fetched items buffered ahead of the database writer: kline batches are a
+# page each, OI snapshots and funding rates are single rows
+KLINE_QUEUE_SIZE = 8
+ROW_QUEUE_SIZE = 10_000
+# Rows accumulated before each upsert and commit
+FLUSH_ROWS = 5000
+
+T = TypeVar("T")
+
 
 # Global state for current session
 class AppState:
@@ -28,6 +63,9 @@ class AppState:
         self.current_symbol: str | None = None
         self.last_analysis: AnalysisResult | None = None
         self.repository: Repository | None = None
+        self.refresh_tail: int = REFRESH_TAIL_BARS
+        # One connector (and HTTP client) per exchange, kept for the session
+        self.connectors: dict[str, ExchangeConnector] = {}
 
 
 state = AppState()
@@ -40,9 +78,242 @@ CONNECTORS = {
 }
 
 
+def _get_connector(exchange_name: str) -> ExchangeConnector:
+    """Get the session's connector for an exchange, creating it on first use.
+
+    Reusing the connector keeps its HTTP connections (and their TLS sessions)
+    alive across fetches.
+
+    Args:
+        exchange_name: Key into CONNECTORS
+
+    Returns:
+        Shared connector instance
+    """
+    connector = state.connectors.get(exchange_name)
+    if connector is None:
+        connector = state.connectors[exchange_name] = CONNECTORS[exchange_name]()
+    return connector
+
+
+async def close_connectors() -> None:
+    """Close every connector opened during the session."""
+    connectors = list(state.connectors.values())
+    state.connectors.clear()
+    await asyncio.gather(*(connector.close() for connector in connectors))
+
+
+async def _fetch_start(
+    repo: Repository,
+    exchange: str,
+    market_type: MarketType,
+    symbol: str,
+    interval: str,
+) -> datetime | None:
+    """Work out where a kline fetch can resume, so stored history is not re-fetched.
+
+    The newest stored candles decide, less the refresh tail so candles the
+    exchange may have revised are fetched again.
+
+    Args:
+        repo: Repository the fetched klines are stored in
+        exchange: Exchange name
+        market_type: Spot or perpetual
+        symbol: Trading pair symbol
+        interval: Kline interval
+
+    Returns:
+        Open time of the first candle to re-fetch, or None to fetch everything
+    """
+    return _resume_time(await repo.get_last_open_time(
+        symbol, interval, exchange, market_type, offset=state.refresh_tail
+    ))
+
+
+def _resume_time(ms: int | None) -> datetime | None:
+    """Convert a stored epoch-ms time into a fetch start_time (None stays None)."""
+    if ms is None:
+        return None
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+
+
+async def _store_stream(
+    items: AsyncIterator[T],
+    write: Callable[[list[T]], Awaitable[int]],
+    queue_size: int,
+    size: Callable[[T], int] = lambda item: 1,
+) -> int:
+    """Write fetched items to the database while the next pages download.
+
+    A producer task pulls items into a bounded queue, so the fetch waits
+    when the database falls behind. Items are written in blocks of at least
+    FLUSH_ROWS rows, plus whatever is left at the end.
+
+    Args:
+        items: Kline batches, OI snapshots or funding rates from a connector
+        write: Upsert for a block of items
+        queue_size: Items buffered ahead of the writer
+        size: Rows in an item (len for kline batches)
+
+    Returns:
+        Number of rows fetched
+    """
+    queue: asyncio.Queue[T | None] = asyncio.Queue(maxsize=queue_size)
+
+    async def produce() -> None:
+        try:
+            async for item in items:
+                await queue.put(item)
+        finally:
+            # End-of-stream marker, unless the writer failed and cancelled us
+            if not asyncio.current_task().cancelling():
+                await queue.put(None)
+
+    producer = asyncio.create_task(produce())
+    fetched_rows = 0
+    pending: list[T] = []
+    pending_rows = 0
+    try:
+        while (item := await queue.get()) is not None:
+            rows = size(item)
+            fetched_rows += rows
+            pending.append(item)
+            pending_rows += rows
+            if pending_rows >= FLUSH_ROWS:
+                await write(pending)
+                pending, pending_rows = [], 0
+        if pending:
+            await write(pending)
+        # Re-raise any fetch error
+        await producer
+    finally:
+        producer.cancel()
+    return fetched_rows
+
+
+async def _locked(lock: asyncio.Lock, write: Awaitable[int]) -> int:
+    """Await a database write while holding the shared writer lock."""
+    async with lock:
+        return await write
+
+
+async def _fetch_exchange(
+    exchange_name: str,
+    symbol: str,
+    market_types: list[str],
+    repo: Repository,
+    write_lock: asyncio.Lock,
+    progress: Progress,
+) -> tuple[int, int, int]:
+    """Fetch klines, OI and funding for a token from one exchange.
+
+    Each flushed block is upserted and committed in its own transaction, one
+    at a time under `write_lock`, so several exchanges can fetch concurrently
+    and a failed or interrupted fetch keeps what was already written.
+
+    Args:
+        exchange_name: Key into CONNECTORS
+        symbol: Trading pair symbol (e.g., COAIUSDT)
+        market_types: List of market types (spot, perp)
+        repo: Repository to write to
+        write_lock: Lock serializing writes across exchanges
+        progress: Progress display to add tasks to
+
+    Returns:
+        Tuple of (klines, OI snapshots, funding rates) saved
+    """
+    total_klines = 0
+    total_oi = 0
+    total_funding = 0
+
+    connector = _get_connector(exchange_name)
+    for market_type_str in market_types:
+        market_type = MarketType(market_type_str)
+        task_desc = f"Fetching {exchange_name} {market_type_str}..."
+        task = progress.add_task(task_desc, total=None)
+
+        # Fetch klines, only pulling the tail past what is already stored
+        kline_count = 0
+        kline_success = False
+        try:
+            start_time = await _fetch_start(repo, exchange_name, market_type, symbol, "1h")
+            kline_count = await _store_stream(
+                connector.fetch_kline_batches(
+                    symbol=symbol,
+                    interval="1h",
+                    market_type=market_type,
+                    start_time=start_time,
+                ),
+                lambda pending: _locked(
+                    write_lock, repo.upsert_kline_batch(KlineBatch.concat(pending))
+                ),
+                KLINE_QUEUE_SIZE,
+                size=len,
+            )
+            total_klines += kline_count
+            kline_success = True
+        except Exception as e:
+            console.print(f"[red]✗ {exchange_name} {market_type_str} klines: {e}[/red]")
+
+        if kline_success:
+            progress.update(task, description=f"[green]✓ {exchange_name} {market_type_str} klines ({kline_count} saved)[/green]")
+        else:
+            progress.update(task, description=f"[red]✗ {exchange_name} {market_type_str} klines (failed)[/red]")
+
+    # Fetch OI (perpetual only)
+    if "perp" in market_types:
+        oi_task = progress.add_task(f"Fetching {exchange_name} OI...", total=None)
+        oi_success = False
+        try:
+            total_oi += await _store_stream(
+                connector.fetch_open_interest_history(
+                    symbol=symbol,
+                    start_time=_resume_time(await repo.get_last_oi_time(symbol, exchange_name)),
+                ),
+                lambda pending: _locked(write_lock, repo.upsert_open_interest(pending)),
+                ROW_QUEUE_SIZE,
+            )
+            oi_success = True
+        except Exception as e:
+            console.print(f"[red]✗ {exchange_name} OI: {e}[/red]")
+
+        if oi_success:
+            progress.update(oi_task, description=f"[green]✓ {exchange_name} OI ({total_oi} saved)[/green]")
+        else:
+            progress.update(oi_task, description=f"[red]✗ {exchange_name} OI (failed)[/red]")
+
+        # Fetch funding rates (perpetual only)
+        funding_task = progress.add_task(f"Fetching {exchange_name} funding rates...", total=None)
+        funding_success = False
+        try:
+            total_funding += await _store_stream(
+                connector.fetch_funding_history(
+                    symbol=symbol,
+                    start_time=_resume_time(
+                        await repo.get_last_funding_time(symbol, exchange_name)
+                    ),
+                ),
+                lambda pending: _locked(write_lock, repo.upsert_funding_rates(pending)),
+                ROW_QUEUE_SIZE,
+            )
+            funding_success = True
+        except Exception as e:
+            console.print(f"[red]✗ {exchange_name} funding: {e}[/red]")
+
+        if funding_success:
+            progress.update(funding_task, description=f"[green]✓ {exchange_name} funding ({total_funding} saved)[/green]")
+        else:
+            progress.update(funding_task, description=f"[red]✗ {exchange_name} funding (failed)[/red]")
+
+    return total_klines, total_oi, total_funding
+
+
 async def fetch_token_data(symbol: str, exchanges: list[str], market_types: list[str]) -> None:
     """Fetch all data for a token from selected exchanges.
 
+    Exchanges are fetched concurrently; their writes are serialized and
+    committed block by block as they arrive.
+
     Args:
         symbol: Trading pair symbol (e.g., COAIUSDT)
         exchanges: List of exchange names
@@ -50,115 +321,29 @@ async def fetch_token_data(symbol: str, exchanges: list[str], market_types: list
     """
     repo = state.repository
     if repo is None:
-        repo = Repository()
-        state.repository = repo
-
-    total_klines = 0
-    total_oi = 0
-    total_funding = 0
+        return
 
+    write_lock = asyncio.Lock()
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         console=console,
     ) as progress:
-        for exchange_name in exchanges:
-            connector_cls = CONNECTORS.get(exchange_name)
-            if not connector_cls:
-                continue
-
-            connector = connector_cls()
-            try:
-                for market_type_str in market_types:
-                    market_type = MarketType(market_type_str)
-                    task_desc = f"Fetching {exchange_name} {market_type_str}..."
-                    task = progress.add_task(task_desc, total=None)
-
-                    # Fetch klines
-                    klines: list[Kline] = []
-                    kline_success = False
-                    try:
-                        async for kline in connector.fetch_klines(
-                            symbol=symbol,
-                            interval="1h",
-                            market_type=market_type,
-                        ):
-                            klines.append(kline)
-                            if len(klines) >= 100:
-                                await repo.upsert_klines(klines)
-                                total_klines += len(klines)
-                                klines = []
-
-                        if klines:
-                            await repo.upsert_klines(klines)
-                            total_klines += len(klines)
-                        kline_success = True
-                    except Exception as e:
-                        console.print(f"[red]✗ {exchange_name} {market_type_str} klines: {e}[/red]")
-
-                    if kline_success:
-                        progress.update(task, description=f"[green]✓ {exchange_name} {market_type_str} klines ({len(klines)} saved)[/green]")
-                    else:
-                        progress.update(task, description=f"[red]✗ {exchange_name} {market_type_str} klines (failed)[/red]")
-
-                # Fetch OI (perpetual only)
-                if "perp" in market_types:
-                    oi_task = progress.add_task(f"Fetching {exchange_name} OI...", total=None)
-                    oi_data: list[OpenInterest] = []
-                    oi_success = False
-                    try:
-                        async for oi in connector.fetch_open_interest_history(symbol=symbol):
-                            oi_data.append(oi)
-                            if len(oi_data) >= 100:
-                                await repo.upsert_open_interest(oi_data)
-                                total_oi += len(oi_data)
-                                oi_data = []
-
-                        if oi_data:
-                            await repo.upsert_open_interest(oi_data)
-                            total_oi += len(oi_data)
-                        oi_success = True
-                    except Exception as e:
-                        console.print(f"[red]✗ {exchange_name} OI: {e}[/red]")
-
-                    if oi_success:
-                        progress.update(oi_task, description=f"[green]✓ {exchange_name} OI ({total_oi} saved)[/green]")
-                    else:
-                        progress.update(oi_task, description=f"[red]✗ {exchange_name} OI (failed)[/red]")
-
-                    # Fetch funding rates (perpetual only)
-                    funding_task = progress.add_task(f"Fetching {exchange_name} funding rates...", total=None)
-                    funding_data: list[FundingRate] = []
-                    funding_success = False
-                    try:
-                        async for fr in connector.fetch_funding_history(symbol=symbol):
-                            funding_data.append(fr)
-                            if len(funding_data) >= 100:
-                                await repo.upsert_funding_rates(funding_data)
-                                total_funding += len(funding_data)
-                                funding_data = []
-
-                        if funding_data:
-                            await repo.upsert_funding_rates(funding_data)
-                            total_funding += len(funding_data)
-                        funding_success = True
-                    except Exception as e:
-                        console.print(f"[red]✗ {exchange_name} funding: {e}[/red]")
-
-                    if funding_success:
-                        progress.update(funding_task, description=f"[green]✓ {exchange_name} funding ({total_funding} saved)[/green]")
-                    else:
-                        progress.update(funding_task, description=f"[red]✗ {exchange_name} funding (failed)[/red]")
-
-            finally:
-                await connector.close()
+        await asyncio.gather(*(
+            _fetch_exchange(exchange_name, symbol, market_types, repo, write_lock, progress)
+            for exchange_name in exchanges
+            if exchange_name in CONNECTORS
+        ))
+
+    # Keep the query planner's statistics in line with the new rows
+    await repo.analyze()
+
+    # New data may have changed cached analysis inputs
+    clear_symbol_cache(symbol)
 
     # Display summary
-    earliest, latest, exchange_avail = await repo.get_available_date_range(symbol)
-    kline_count = await repo.get_kline_count(symbol)
-    oi_count = await repo.get_oi_count(symbol)
-    funding_count = await repo.get_funding_count(symbol)
-    exchange_ranges = await repo.get_exchange_date_ranges(symbol)
+    summary = await repo.get_symbol_summary(symbol)
+    earliest, latest = summary.earliest, summary.latest
 
     # Format exchange date ranges for display
     formatted_ranges = {
@@ -166,23 +351,66 @@ async def fetch_token_data(symbol: str, exchanges: list[str], market_types: list
             dates[0].strftime("%Y-%m-%d") if dates[0] else "N/A",
             dates[1].strftime("%Y-%m-%d") if dates[1] else "N/A",
         )
-        for ex, dates in exchange_ranges.items()
+        for ex, dates in summary.exchange_ranges.items()
     }
 
     display_data_summary(
         symbol=symbol,
-        kline_count=kline_count,
-        oi_count=oi_count,
-        funding_count=funding_count,
+        kline_count=summary.kline_count,
+        oi_count=summary.oi_count,
+        funding_count=summary.funding_count,
         earliest=earliest.strftime("%Y-%m-%d %H:%M") if earliest else None,
         latest=latest.strftime("%Y-%m-%d %H:%M") if latest else None,
-        exchanges=exchange_avail,
+        exchanges=summary.exchanges,
         exchange_date_ranges=formatted_ranges,
     )
 
     state.current_symbol = symbol
 
 
+async def _calculate_analysis(
+    repo: Repository, symbol: str, start_time: datetime, end_time: datetime
+) -> AnalysisResult | None:
+    """Load a symbol's stored data for a date range and calculate its deltas.
+
+    Args:
+        repo: Repository to read from
+        symbol: Trading pair symbol
+        start_time: Analysis start time
+        end_time: Analysis end time
+
+    Returns:
+        AnalysisResult, or None if no klines are stored for the range
+    """
+    # Plain column arrays straight from the cursor, no ORM rows
+    columns = await repo.get_kline_columns(
+        symbol=symbol,
+        interval="1h",
+        start_time=start_time,
+        end_time=end_time,
+    )
+    if not len(columns["open_time"]):
+        return None
+    oi_data = await repo.get_open_interest(
+        symbol=symbol,
+        start_time=start_time,
+        end_time=end_time,
+    )
+    funding_data = await repo.get_funding_rates(
+        symbol=symbol,
+        start_time=start_time,
+        end_time=end_time,
+    )
+    return calculate_deltas(
+        klines=kline_columns_to_df(columns),
+        oi_data=oi_data,
+        start_time=start_time,
+        end_time=end_time,
+        funding_data=funding_data,
+        symbol=symbol,
+    )
+
+
 async def run_analysis() -> AnalysisResult | None:
     """Run analysis on current token data.
 
@@ -197,8 +425,9 @@ async def run_analysis() -> AnalysisResult | None:
     if repo is None:
         return None
 
-    # Get available date range
-    earliest, latest, _ = await repo.get_available_date_range(state.current_symbol)
+    # Get available date range, overall and per exchange
+    summary = await repo.get_symbol_summary(state.current_symbol)
+    earliest, latest = summary.earliest, summary.latest
 
     if not earliest or not latest:
         console.print("[yellow]No data available for this token.[/yellow]")
@@ -212,9 +441,8 @@ async def run_analysis() -> AnalysisResult | None:
     start_time, end_time = date_range
 
     # Check which exchanges have data in this range
-    exchange_ranges = await repo.get_exchange_date_ranges(state.current_symbol)
     missing_exchanges = []
-    for ex, (ex_start, ex_end) in exchange_ranges.items():
+    for ex, (ex_start, ex_end) in summary.exchange_ranges.items():
         if ex_start and ex_start > end_time:
             missing_exchanges.append(f"{ex} (data starts {ex_start.strftime('%Y-%m-%d')})")
         elif ex_end and ex_end < start_time:
@@ -227,51 +455,28 @@ async def run_analysis() -> AnalysisResult | None:
             console.print(f"  [dim]• {ex_msg}[/dim]")
         console.print()
 
-    # Fetch data from repository
-    klines = await repo.get_klines(
-        symbol=state.current_symbol,
-        interval="1h",
-        start_time=start_time,
-        end_time=end_time,
-    )
-    oi_data = await repo.get_open_interest(
-        symbol=state.current_symbol,
-        start_time=start_time,
-        end_time=end_time,
-    )
-
-    if not klines:
-        console.print("[yellow]No kline data found for this date range.[/yellow]")
-        return None
+    # Reuse a cached result for the same range; fetches clear the cache
+    cache_path = analysis_cache_path(state.current_symbol, start_time, end_time, latest)
+    result = read_cached_analysis(cache_path)
+    if result is None:
+        result = await _calculate_analysis(repo, state.current_symbol, start_time, end_time)
+        if result is None:
+            console.print("[yellow]No kline data found for this date range.[/yellow]")
+            return None
+        write_cached_analysis(result, cache_path)
 
     # Check OI data availability
-    if not oi_data:
+    if result.raw_oi is None:
         console.print("[dim]Note: No OI data available for this date range. OI will show as '-'.[/dim]")
 
-    # Fetch funding data
-    funding_data = await repo.get_funding_rates(
-        symbol=state.current_symbol,
-        start_time=start_time,
-        end_time=end_time,
-    )
-
-    # Calculate deltas
-    result = calculate_deltas(
-        klines=klines,
-        oi_data=oi_data,
-        start_time=start_time,
-        end_time=end_time,
-        funding_data=funding_data,
-    )
-
     # Display results
     display_analysis(result)
 
     # Display funding stats and plot if available
-    if funding_data:
-        funding_stats = get_latest_funding_stats(funding_data, window_periods=3)
+    if result.raw_funding is not None:
+        funding_stats = get_latest_funding_stats(result.raw_funding, window_periods=3)
         display_funding_stats(funding_stats)
-        display_funding_plot(funding_data, console, symbol=state.current_symbol)
+        display_funding_plot(result.raw_funding, console, symbol=state.current_symbol)
     else:
         console.print("[dim]Note: No funding data available for this date range.[/dim]")
 
@@ -289,21 +494,31 @@ async def do_export() -> None:
     if not format_choice:
         return
 
+    # One directory setup and timestamp shared by every file of this export
+    output_dir, timestamp = prepare_output()
+
+    # The exports are blocking pandas/file work; keep them off the event loop
     if format_choice == "analysis_range":
-        csv_path = export_analysis_range_csv(state.last_analysis)
+        csv_path = await asyncio.to_thread(
+            export_analysis_range_csv, state.last_analysis, output_dir, timestamp
+        )
         console.print(f"[green]✓ Exported 1H analysis range to {csv_path}[/green]")
 
     if format_choice in ("csv", "both"):
-        csv_path = export_csv(state.last_analysis)
+        csv_path = await asyncio.to_thread(export_csv, state.last_analysis, output_dir, timestamp)
         console.print(f"[green]✓ Exported to {csv_path}[/green]")
 
     if format_choice in ("json", "both"):
-        json_path = export_json(state.last_analysis)
+        json_path = await asyncio.to_thread(export_json, state.last_analysis, output_dir, timestamp)
         console.print(f"[green]✓ Exported to {json_path}[/green]")
 
 
 async def main_loop() -> None:
     """Main application loop."""
+    # Python 3.12+: tasks that finish without suspending skip the scheduler
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
     # Initialize database
     await init_db()
     state.repository = Repository()
@@ -314,60 +529,115 @@ async def main_loop() -> None:
     console.print("[bold cyan]╚══════════════════════════════════════╝[/bold cyan]")
     console.print()
 
-    while True:
-        action = await menu.main_menu()
-
-        if action == "exit" or action is None:
-            console.print("[dim]Goodbye![/dim]")
-            break
-
-        elif action == "fetch":
-            token = await menu.token_input()
-            if not token:
-                continue
-
-            # Build symbol
-            symbol = f"{token.upper()}USDT"
-            console.print(f"[cyan]Looking for {symbol}...[/cyan]")
-
-            exchanges = await menu.exchange_select()
-            if not exchanges:
-                continue
-
-            market_types = await menu.market_type_select()
-            if not market_types:
-                continue
-
-            await fetch_token_data(symbol, exchanges, market_types)
-
-        elif action == "analyze":
-            result = await run_analysis()
-            if result:
-                # Post-analysis menu
-                while True:
-                    next_action = await menu.post_analysis_menu()
-                    if next_action == "analyze":
-                        result = await run_analysis()
-                        if not result:
+    try:
+        while True:
+            action = await menu.main_menu()
+
+            if action == "exit" or action is None:
+                console.print("[dim]Goodbye![/dim]")
+                break
+
+            elif action == "fetch":
+                token = await menu.token_input()
+                if not token:
+                    continue
+
+                # Build symbol
+                symbol = f"{token.upper()}USDT"
+                console.print(f"[cyan]Looking for {symbol}...[/cyan]")
+
+                exchanges = await menu.exchange_select()
+                if not exchanges:
+                    continue
+
+                market_types = await menu.market_type_select()
+                if not market_types:
+                    continue
+
+                await fetch_token_data(symbol, exchanges, market_types)
+
+            elif action == "analyze":
+                result = await run_analysis()
+                if result:
+                    # Post-analysis menu
+                    while True:
+                        next_action = await menu.post_analysis_menu()
+                        if next_action == "analyze":
+                            result = await run_analysis()
+                            if not result:
+                                break
+                        elif next_action == "export":
+                            await do_export()
+                        elif next_action == "fetch":
+                            break  # Go back to main menu fetch
+                        elif next_action in ("main", "exit", None):
+                            if next_action == "exit":
+                                console.print("[dim]Goodbye![/dim]")
+                                return
                             break
-                    elif next_action == "export":
-                        await do_export()
-                    elif next_action == "fetch":
-                        break  # Go back to main menu fetch
-                    elif next_action in ("main", "exit", None):
-                        if next_action == "exit":
-                            console.print("[dim]Goodbye![/dim]")
-                            return
-                        break
 
-        elif action == "export":
-            await do_export()
+            elif action == "export":
+                await do_export()
+    finally:
+        await close_connectors()
+
+
+async def _archive(dest: Path) -> Path:
+    """Archive the database and close the engine."""
+    try:
+        return await archive_db(dest)
+    finally:
+        await close_db()
+
+
+def _run(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on uvloop when installed, else the default asyncio loop."""
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
 
 
 def main():
     """Entry point."""
+    parser = argparse.ArgumentParser(prog="liqmap", description="Liquidity Mapping CLI")
+    parser.add_argument(
+        "--refresh-tail",
+        type=int,
+        default=REFRESH_TAIL_BARS,
+        metavar="N",
+        help="re-fetch the last N stored candles per market (default: %(default)s)",
+    )
+    archive_group = parser.add_mutually_exclusive_group()
+    archive_group.add_argument(
+        "--archive",
+        type=Path,
+        metavar="PATH",
+        help="write a compacted (and, with zstandard, compressed) copy of the database and exit",
+    )
+    archive_group.add_argument(
+        "--restore",
+        type=Path,
+        metavar="ARCHIVE",
+        help="restore the database from an --archive copy and exit",
+    )
+    args = parser.parse_args()
+    state.refresh_tail = max(args.refresh_tail, 0)
+
+    if args.archive:
+        written = _run(_archive(args.archive))
+        console.print(f"[green]Database archived to {written}[/green]")
+        return
+    if args.restore:
+        db_path = Path.cwd() / "liquidity.db"
+        if db_path.exists():
+            console.print(f"[red]{db_path} already exists; move it aside before restoring[/red]")
+            sys.exit(1)
+        restored = restore_db(args.restore, db_path)
+        console.print(f"[green]Database restored to {restored}[/green]")
+        return
+
     try:
-        asyncio.run(main_loop())
+        _run(main_loop())
     except KeyboardInterrupt:
         console.print("\n[dim]Interrupted. Goodbye![/dim]")
         sys.exit(0)
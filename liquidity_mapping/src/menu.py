@@ -1,6 +1,6 @@
 """Arrow-key menu system using questionary."""
 
-from datetime import datetime
+from datetime import date, datetime, time
 
 import questionary
 from questionary import Style
@@ -17,6 +17,40 @@ custom_style = Style([
     ("instruction", "fg:gray"),
 ])
 
+# Menu choices, built once; questionary copies them into its own list
+_MAIN_CHOICES = (
+    questionary.Choice("Fetch token data", value="fetch"),
+    questionary.Choice("Analyze date range", value="analyze"),
+    questionary.Choice("Export results", value="export"),
+    questionary.Choice("Exit", value="exit"),
+)
+
+_EXCHANGE_CHOICES = (
+    questionary.Choice("Binance", value="binance", checked=True),
+    questionary.Choice("ByBit", value="bybit", checked=True),
+    questionary.Choice("BitGet", value="bitget", checked=True),
+)
+
+_MARKET_CHOICES = (
+    questionary.Choice("Spot", value="spot", checked=True),
+    questionary.Choice("Perpetual", value="perp", checked=True),
+)
+
+_EXPORT_CHOICES = (
+    questionary.Choice("1H Analysis Range (Price, VWAP, Funding, Volume, Volume $USD)", value="analysis_range"),
+    questionary.Choice("CSV (summary + raw klines)", value="csv"),
+    questionary.Choice("JSON", value="json"),
+    questionary.Choice("Both CSV + JSON", value="both"),
+)
+
+_POST_ANALYSIS_CHOICES = (
+    questionary.Choice("Analyze different date range", value="analyze"),
+    questionary.Choice("Export these results", value="export"),
+    questionary.Choice("Fetch new token", value="fetch"),
+    questionary.Choice("Return to main menu", value="main"),
+    questionary.Choice("Exit", value="exit"),
+)
+
 
 async def main_menu() -> str:
     """Display main menu and return selected action.
@@ -26,12 +60,7 @@ async def main_menu() -> str:
     """
     return await questionary.select(
         "What would you like to do?",
-        choices=[
-            questionary.Choice("Fetch token data", value="fetch"),
-            questionary.Choice("Analyze date range", value="analyze"),
-            questionary.Choice("Export results", value="export"),
-            questionary.Choice("Exit", value="exit"),
-        ],
+        choices=_MAIN_CHOICES,
         style=custom_style,
     ).ask_async()
 
@@ -56,11 +85,7 @@ async def exchange_select() -> list[str]:
     """
     result = await questionary.checkbox(
         "Select exchanges to fetch from:",
-        choices=[
-            questionary.Choice("Binance", value="binance", checked=True),
-            questionary.Choice("ByBit", value="bybit", checked=True),
-            questionary.Choice("BitGet", value="bitget", checked=True),
-        ],
+        choices=_EXCHANGE_CHOICES,
         style=custom_style,
     ).ask_async()
     return result or []
@@ -74,10 +99,7 @@ async def market_type_select() -> list[str]:
     """
     result = await questionary.checkbox(
         "Select market types:",
-        choices=[
-            questionary.Choice("Spot", value="spot", checked=True),
-            questionary.Choice("Perpetual", value="perp", checked=True),
-        ],
+        choices=_MARKET_CHOICES,
         style=custom_style,
     ).ask_async()
     return result or []
@@ -117,10 +139,10 @@ async def date_range_input(
         return None
 
     try:
-        start_date = datetime.strptime(start_str.strip(), "%Y-%m-%d")
-        end_date = datetime.strptime(end_str.strip(), "%Y-%m-%d")
+        # date.fromisoformat parses YYYY-MM-DD in C, without a format string
+        start_date = datetime.combine(date.fromisoformat(start_str.strip()), time())
         # Set end date to end of day
-        end_date = end_date.replace(hour=23, minute=59, second=59)
+        end_date = datetime.combine(date.fromisoformat(end_str.strip()), time(23, 59, 59))
         return start_date, end_date
     except ValueError:
         return None
@@ -134,12 +156,7 @@ async def export_format_select() -> str:
     """
     return await questionary.select(
         "Select export format:",
-        choices=[
-            questionary.Choice("1H Analysis Range (Price, VWAP, Funding, Volume, Volume $USD)", value="analysis_range"),
-            questionary.Choice("CSV (summary + raw klines)", value="csv"),
-            questionary.Choice("JSON", value="json"),
-            questionary.Choice("Both CSV + JSON", value="both"),
-        ],
+        choices=_EXPORT_CHOICES,
         style=custom_style,
     ).ask_async()
 
@@ -168,12 +185,6 @@ async def post_analysis_menu() -> str:
     """
     return await questionary.select(
         "What would you like to do next?",
-        choices=[
-            questionary.Choice("Analyze different date range", value="analyze"),
-            questionary.Choice("Export these results", value="export"),
-            questionary.Choice("Fetch new token", value="fetch"),
-            questionary.Choice("Return to main menu", value="main"),
-            questionary.Choice("Exit", value="exit"),
-        ],
+        choices=_POST_ANALYSIS_CHOICES,
         style=custom_style,
     ).ask_async()
@@ -1,7 +1,12 @@
 """Output formatters for terminal and file export."""
 
 from src.output.terminal import display_analysis
-from src.output.export import export_csv, export_json, export_analysis_range_csv
+from src.output.export import (
+    export_csv,
+    export_json,
+    export_analysis_range_csv,
+    prepare_output,
+)
 from src.output.plots import display_price_volume_plot
 
 __all__ = [
@@ -9,5 +14,6 @@ __all__ = [
     "export_csv",
     "export_json",
     "export_analysis_range_csv",
+    "prepare_output",
     "display_price_volume_plot",
 ]
@@ -1,15 +1,55 @@
 """Export analysis results to CSV and JSON."""
 
-import json
 from datetime import datetime
+from operator import attrgetter
 from pathlib import Path
 
+import orjson
 import pandas as pd
 
-from src.analysis.calculator import AnalysisResult
+from src.analysis.calculator import AnalysisResult, TimeframeDelta
 
+# TimeframeDelta fields written to the analysis CSV, in column order
+_DELTA_COLUMNS = (
+    "timeframe",
+    "price_start",
+    "price_end",
+    "price_delta",
+    "price_delta_pct",
+    "volume_total",
+    "oi_start",
+    "oi_end",
+    "oi_delta",
+    "vwap",
+)
 
-def export_csv(result: AnalysisResult, output_dir: Path | None = None) -> Path:
+
+def prepare_output(
+    output_dir: Path | None = None, timestamp: str | None = None
+) -> tuple[Path, str]:
+    """Resolve and create the export directory and pick the file name timestamp.
+
+    Call once and pass the results to several exports so they share one
+    directory setup and matching file names.
+
+    Args:
+        output_dir: Output directory (defaults to cwd)
+        timestamp: Timestamp to reuse (defaults to now)
+
+    Returns:
+        Tuple of (output directory, "YYYYmmdd_HHMMSS" timestamp)
+    """
+    if timestamp is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if output_dir is None:
+        output_dir = Path.cwd()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    return output_dir, timestamp
+
+
+def export_csv(
+    result: AnalysisResult, output_dir: Path | None = None, timestamp: str | None = None
+) -> Path:
     """Export analysis results to CSV files.
 
     Creates two files:
@@ -19,63 +59,57 @@ def export_csv(result: AnalysisResult, output_dir: Path | None = None) -> Path:
     Args:
         result: AnalysisResult from calculator
         output_dir: Output directory (defaults to cwd)
+        timestamp: File name timestamp; with output_dir, both as returned by
+            prepare_output (defaults to now)
 
     Returns:
         Path to the analysis CSV file
     """
-    if output_dir is None:
-        output_dir = Path.cwd()
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if output_dir is None or timestamp is None:
+        output_dir, timestamp = prepare_output(output_dir, timestamp)
 
     # Export raw klines
     if not result.raw_klines.empty:
         kline_path = output_dir / f"{result.symbol}_klines_{timestamp}.csv"
         result.raw_klines.to_csv(kline_path, index=False)
 
-    # Export analysis summary
-    analysis_rows = []
-    for exchange_analysis in result.exchange_analyses:
-        for delta in exchange_analysis.timeframe_deltas:
-            analysis_rows.append({
-                "symbol": result.symbol,
-                "exchange": exchange_analysis.exchange,
-                "market_type": exchange_analysis.market_type,
-                "timeframe": delta.timeframe,
-                "price_start": delta.price_start,
-                "price_end": delta.price_end,
-                "price_delta": delta.price_delta,
-                "price_delta_pct": delta.price_delta_pct,
-                "volume_total": delta.volume_total,
-                "oi_start": delta.oi_start,
-                "oi_end": delta.oi_end,
-                "oi_delta": delta.oi_delta,
-                "vwap": delta.vwap,
-            })
-
-    analysis_df = pd.DataFrame(analysis_rows)
+    # Export analysis summary, one tuple per timeframe delta
+    delta_fields = attrgetter(*_DELTA_COLUMNS)
+    records = [
+        (result.symbol, exchange_analysis.exchange, exchange_analysis.market_type)
+        + delta_fields(delta)
+        for exchange_analysis in result.exchange_analyses
+        for delta in exchange_analysis.timeframe_deltas
+    ]
+    analysis_df = (
+        pd.DataFrame.from_records(
+            records, columns=["symbol", "exchange", "market_type", *_DELTA_COLUMNS]
+        )
+        if records
+        else pd.DataFrame()
+    )
     analysis_path = output_dir / f"{result.symbol}_analysis_{timestamp}.csv"
     analysis_df.to_csv(analysis_path, index=False)
 
     return analysis_path
 
 
-def export_analysis_range_csv(result: AnalysisResult, output_dir: Path | None = None) -> Path:
+def export_analysis_range_csv(
+    result: AnalysisResult, output_dir: Path | None = None, timestamp: str | None = None
+) -> Path:
     """Export 1H analysis range data to CSV with Price, VWAP, Funding, Volume, Volume $USD.
 
     Args:
         result: AnalysisResult from calculator
         output_dir: Output directory (defaults to cwd)
+        timestamp: File name timestamp; with output_dir, both as returned by
+            prepare_output (defaults to now)
 
     Returns:
         Path to the CSV file
     """
-    if output_dir is None:
-        output_dir = Path.cwd()
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if output_dir is None or timestamp is None:
+        output_dir, timestamp = prepare_output(output_dir, timestamp)
 
     if result.raw_klines.empty:
         # Create empty file if no data
@@ -83,54 +117,40 @@ def export_analysis_range_csv(result: AnalysisResult, output_dir: Path | None =
         pd.DataFrame().to_csv(csv_path, index=False)
         return csv_path
 
-    # Build the 1H data export
-    rows = []
-    klines_df = result.raw_klines.copy()
+    # Build the 1H data export, one row per candle
+    klines_df = result.raw_klines
     funding_df = result.raw_funding
-
-    # Sort klines by time
-    klines_df = klines_df.sort_values("open_time")
-
-    # Group by exchange and market type
-    for (exchange, market_type), group in klines_df.groupby(["exchange", "market_type"]):
-        group = group.sort_values("open_time")
-
-        # Get funding data for this exchange
-        exchange_funding = None
-        if funding_df is not None and not funding_df.empty:
-            exchange_funding = funding_df[funding_df["exchange"] == exchange].copy()
-            if not exchange_funding.empty:
-                exchange_funding = exchange_funding.sort_values("funding_time")
-
-        for _, row in group.iterrows():
-            # Calculate VWAP for this candle (typical price)
-            typical_price = (row["high"] + row["low"] + row["close"]) / 3
-            vwap = typical_price  # Single candle VWAP is just the typical price
-
-            # Find funding rate for this hour (funding is typically every 8h, so get nearest)
-            funding_rate = None
-            if exchange_funding is not None and not exchange_funding.empty:
-                # Find funding rate that applies to this hour
-                open_time = row["open_time"]
-                # Get the most recent funding rate at or before this time
-                prior_funding = exchange_funding[exchange_funding["funding_time"] <= open_time]
-                if not prior_funding.empty:
-                    funding_rate = prior_funding.iloc[-1]["funding_rate"]
-
-            rows.append({
-                "timestamp": row["open_time"],
-                "exchange": exchange,
-                "market_type": market_type,
-                "price": row["close"],
-                "vwap": round(vwap, 6),
-                "funding": funding_rate,
-                "volume": row["volume"],
-                "volume_usd": row["quote_volume"],
-            })
-
-    # Create DataFrame and export
-    export_df = pd.DataFrame(rows)
-    export_df = export_df.sort_values(["timestamp", "exchange", "market_type"])
+    export_df = pd.DataFrame({
+        "timestamp": klines_df["open_time"],
+        "exchange": klines_df["exchange"],
+        "market_type": klines_df["market_type"],
+        "price": klines_df["close"],
+        # Single candle VWAP is just the typical price
+        "vwap": ((klines_df["high"] + klines_df["low"] + klines_df["close"]) / 3).round(6),
+        "volume": klines_df["volume"],
+        "volume_usd": klines_df["quote_volume"],
+    }).sort_values("timestamp", kind="stable")
+
+    # Attach the most recent funding rate at or before each candle, per exchange
+    # (funding is typically every 8h)
+    if funding_df is not None and not funding_df.empty:
+        funding = funding_df[["exchange", "funding_time", "funding_rate"]].sort_values(
+            "funding_time", kind="stable"
+        )
+        export_df = pd.merge_asof(
+            export_df,
+            funding.rename(columns={"funding_rate": "funding"}),
+            left_on="timestamp",
+            right_on="funding_time",
+            by="exchange",
+            direction="backward",
+        ).drop(columns="funding_time")
+    else:
+        export_df["funding"] = None
+
+    export_df = export_df[
+        ["timestamp", "exchange", "market_type", "price", "vwap", "funding", "volume", "volume_usd"]
+    ].sort_values(["timestamp", "exchange", "market_type"])
 
     csv_path = output_dir / f"{result.symbol}_1h_analysis_{timestamp}.csv"
     export_df.to_csv(csv_path, index=False)
@@ -138,21 +158,22 @@ def export_analysis_range_csv(result: AnalysisResult, output_dir: Path | None =
     return csv_path
 
 
-def export_json(result: AnalysisResult, output_dir: Path | None = None) -> Path:
+def export_json(
+    result: AnalysisResult, output_dir: Path | None = None, timestamp: str | None = None
+) -> Path:
     """Export analysis results to JSON file.
 
     Args:
         result: AnalysisResult from calculator
         output_dir: Output directory (defaults to cwd)
+        timestamp: File name timestamp; with output_dir, both as returned by
+            prepare_output (defaults to now)
 
     Returns:
         Path to the JSON file
     """
-    if output_dir is None:
-        output_dir = Path.cwd()
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if output_dir is None or timestamp is None:
+        output_dir, timestamp = prepare_output(output_dir, timestamp)
 
     output = {
         "symbol": result.symbol,
@@ -160,44 +181,54 @@ def export_json(result: AnalysisResult, output_dir: Path | None = None) -> Path:
             "start": result.start_time.isoformat(),
             "end": result.end_time.isoformat(),
         },
-        "exchanges": [],
+        "exchanges": [
+            {
+                "exchange": exchange_analysis.exchange,
+                "market_type": exchange_analysis.market_type,
+                "timeframes": [
+                    _delta_json(delta) for delta in exchange_analysis.timeframe_deltas
+                ],
+            }
+            for exchange_analysis in result.exchange_analyses
+        ],
     }
 
-    for exchange_analysis in result.exchange_analyses:
-        exchange_data = {
-            "exchange": exchange_analysis.exchange,
-            "market_type": exchange_analysis.market_type,
-            "timeframes": [],
-        }
-
-        for delta in exchange_analysis.timeframe_deltas:
-            exchange_data["timeframes"].append({
-                "timeframe": delta.timeframe,
-                "price": {
-                    "start": delta.price_start,
-                    "end": delta.price_end,
-                    "delta": delta.price_delta,
-                    "delta_pct": delta.price_delta_pct,
-                },
-                "volume_total": delta.volume_total,
-                "open_interest": {
-                    "start": delta.oi_start,
-                    "end": delta.oi_end,
-                    "delta": delta.oi_delta,
-                } if delta.oi_start is not None else None,
-                "vwap": delta.vwap,
-            })
-
-        output["exchanges"].append(exchange_data)
-
     # Add raw data summary
     output["raw_data"] = {
         "kline_count": len(result.raw_klines) if not result.raw_klines.empty else 0,
-        "oi_count": len(result.raw_oi) if not result.raw_oi.empty else 0,
+        "oi_count": len(result.raw_oi) if result.raw_oi is not None else 0,
     }
 
     json_path = output_dir / f"{result.symbol}_analysis_{timestamp}.json"
-    with open(json_path, "w") as f:
-        json.dump(output, f, indent=2, default=str)
+    json_path.write_bytes(
+        orjson.dumps(output, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY, default=str)
+    )
 
     return json_path
+
+
+def _delta_json(delta: TimeframeDelta) -> dict:
+    """Build the JSON object for one timeframe delta.
+
+    Args:
+        delta: TimeframeDelta from an ExchangeAnalysis
+
+    Returns:
+        Dict with price, volume, open interest and VWAP fields
+    """
+    return {
+        "timeframe": delta.timeframe,
+        "price": {
+            "start": delta.price_start,
+            "end": delta.price_end,
+            "delta": delta.price_delta,
+            "delta_pct": delta.price_delta_pct,
+        },
+        "volume_total": delta.volume_total,
+        "open_interest": {
+            "start": delta.oi_start,
+            "end": delta.oi_end,
+            "delta": delta.oi_delta,
+        } if delta.oi_start is not None else None,
+        "vwap": delta.vwap,
+    }
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import math
 from typing import TYPE_CHECKING
 
+import numpy as np
 import pandas as pd
 import plotext as plt
 from rich.ansi import AnsiDecoder
@@ -11,6 +13,9 @@ from rich.console import Console, ConsoleOptions, Group, RenderResult
 from rich.jupyter import JupyterMixin
 from rich.panel import Panel
 
+from src.analysis.calculator import funding_to_df
+from src.analysis.funding import ANNUALIZATION_FACTOR
+
 if TYPE_CHECKING:
     from src.analysis.calculator import AnalysisResult
     from src.db.models import FundingRateModel
@@ -51,11 +56,20 @@ def prepare_plot_data(raw_klines: pd.DataFrame) -> pd.DataFrame:
     if raw_klines.empty:
         return pd.DataFrame(columns=["open_time", "close", "vwap", "volume_usd"])
 
-    df = raw_klines.copy()
-
-    # Calculate typical price (for VWAP) per candle
-    df["typical_price"] = (df["high"] + df["low"] + df["close"]) / 3
-    df["tp_volume"] = df["typical_price"] * df["volume"]
+    # Typical price * volume per candle in one fused NumPy pass (for VWAP);
+    # only the columns the aggregation needs are carried along
+    volume = raw_klines["volume"].to_numpy()
+    tp_volume = np.add(raw_klines["high"].to_numpy(), raw_klines["low"].to_numpy())
+    np.add(tp_volume, raw_klines["close"].to_numpy(), out=tp_volume)
+    np.divide(tp_volume, 3, out=tp_volume)
+    np.multiply(tp_volume, volume, out=tp_volume)
+    df = pd.DataFrame({
+        "open_time": raw_klines["open_time"],
+        "close": raw_klines["close"],
+        "volume": volume,
+        "quote_volume": raw_klines["quote_volume"],
+        "tp_volume": tp_volume,
+    }, copy=False)
 
     # Aggregate by hour (combine all exchanges/market types)
     hourly = df.groupby("open_time").agg({
@@ -73,15 +87,40 @@ def prepare_plot_data(raw_klines: pd.DataFrame) -> pd.DataFrame:
     hourly = hourly.rename(columns={"quote_volume": "volume_usd"})
     hourly = hourly.sort_values("open_time")
 
-    # Downsample if too many points
+    # Downsample if too many points: each bucket is a true aggregate
     max_points = 100
     if len(hourly) > max_points:
-        step = len(hourly) // max_points
-        hourly = hourly.iloc[::step].reset_index(drop=True)
+        hourly = _downsample(hourly, "open_time", max_points, {
+            "close": "last",
+            "volume": "sum",
+            "volume_usd": "sum",
+            "tp_volume": "sum",
+        })
+        hourly["vwap"] = (hourly["tp_volume"] / hourly["volume"]).fillna(hourly["close"])
 
     return hourly[["open_time", "close", "vwap", "volume_usd"]]
 
 
+def _downsample(df: pd.DataFrame, time_column: str, max_points: int, agg: dict) -> pd.DataFrame:
+    """Aggregate a time series into at most max_points + 1 whole-hour buckets.
+
+    Args:
+        df: DataFrame sorted by time_column
+        time_column: Datetime column to bucket on
+        max_points: Target number of buckets
+        agg: Column -> aggregation, as for DataFrame.agg
+
+    Returns:
+        DataFrame with one row per non-empty bucket, labelled by bucket start
+    """
+    times = df[time_column]
+    span_hours = (times.iloc[-1] - times.iloc[0]) / pd.Timedelta(hours=1)
+    bucket = pd.Timedelta(hours=max(1, math.ceil(span_hours / max_points)))
+    resampled = df.resample(bucket, on=time_column, origin="start").agg(agg)
+    # Gaps in the data leave empty buckets behind
+    return resampled.dropna(subset=[next(iter(agg))]).reset_index()
+
+
 def _create_single_plot(
     x_indices: list,
     y_data: list,
@@ -115,10 +154,7 @@ def _create_single_plot(
     Returns:
         ANSI-encoded plot string
     """
-    plt.clf()
-    plt.clear_figure()
-    plt.clear_data()
-    plt.clear_color()
+    plt.clear_figure()  # also resets data, colors and theme
     plt.theme("dark")
     plt.plotsize(width, height)
 
@@ -138,6 +174,22 @@ def _create_single_plot(
     return plt.build()
 
 
+def _time_ticks(times: pd.Series, max_ticks: int = 10) -> tuple[list[int], list[str]]:
+    """Pick evenly spaced x-axis ticks and format only their dates.
+
+    Args:
+        times: Datetime column plotted against its row position
+        max_ticks: Maximum number of ticks
+
+    Returns:
+        Tuple of (tick positions, "dd/mm HH:MM" labels)
+    """
+    tick_step = max(1, len(times) // min(max_ticks, len(times)))
+    tick_indices = list(range(0, len(times), tick_step))
+    tick_labels = times.iloc[::tick_step].dt.strftime("%d/%m %H:%M").tolist()
+    return tick_indices, tick_labels
+
+
 def _format_axis_value(value: float) -> str:
     """Format large numbers with K/M/B suffixes for axis labels.
 
@@ -183,22 +235,15 @@ def create_price_volume_plot(
     vwaps = df["vwap"].tolist()
     volumes = df["volume_usd"].tolist()
 
-    # Create date labels for x-axis ticks
-    date_labels = [dt.strftime("%d/%m %H:%M") for dt in df["open_time"]]
-    num_ticks = min(10, len(x_indices))
-    tick_step = max(1, len(x_indices) // num_ticks)
-    tick_indices = x_indices[::tick_step]
-    tick_labels = date_labels[::tick_step]
+    # Date labels for the x-axis ticks
+    tick_indices, tick_labels = _time_ticks(df["open_time"])
 
     # Calculate heights for each pane
     price_height = int(height * 0.65)
     volume_height = int(height * 0.35)
 
     # === VWAP Plot ===
-    plt.clf()
-    plt.clear_figure()
-    plt.clear_data()
-    plt.clear_color()
+    plt.clear_figure()  # also resets data, colors and theme
     plt.theme("dark")
     plt.plotsize(width, price_height)
     plt.title(title)
@@ -219,10 +264,7 @@ def create_price_volume_plot(
     price_plot = plt.build()
 
     # === Volume Plot ===
-    plt.clf()
-    plt.clear_figure()
-    plt.clear_data()
-    plt.clear_color()
+    plt.clear_figure()  # also resets data, colors and theme
     plt.theme("dark")
     plt.plotsize(width, volume_height)
 
@@ -312,60 +354,51 @@ def display_price_volume_plot(
 
 
 def prepare_funding_plot_data(
-    funding_rates: list[FundingRateModel],
+    funding_rates: list[FundingRateModel] | pd.DataFrame,
     window_periods: int = 1,
 ) -> pd.DataFrame:
     """Prepare funding rate data for plotting with rolling average.
 
     Args:
-        funding_rates: List of FundingRateModel objects
+        funding_rates: List of FundingRateModel objects, or a DataFrame built
+            from them (e.g. AnalysisResult.raw_funding)
         window_periods: Rolling window size (default 1 for 1-period avg)
 
     Returns:
         DataFrame with funding_time and annualized_rate columns
     """
-    if not funding_rates:
+    if funding_rates is None or len(funding_rates) == 0:
         return pd.DataFrame(columns=["funding_time", "annualized_rate"])
 
-    df = pd.DataFrame([
-        {
-            "exchange": fr.exchange,
-            "funding_time": fr.funding_time,
-            "funding_rate": fr.funding_rate,
-        }
-        for fr in funding_rates
-    ]).sort_values("funding_time")
+    if not isinstance(funding_rates, pd.DataFrame):
+        funding_rates = funding_to_df(funding_rates)
+    df = funding_rates.sort_values("funding_time")
 
     if df.empty:
         return pd.DataFrame(columns=["funding_time", "annualized_rate"])
 
-    # Pivot to get funding rate per exchange at each timestamp
-    pivot_df = df.pivot_table(
-        index="funding_time",
-        columns="exchange",
-        values="funding_rate",
-        aggfunc="mean",
-    )
-
-    # Average across exchanges for each timestamp
-    avg_rate = pivot_df.mean(axis=1)
+    # Average across exchanges for each timestamp (one row per exchange per
+    # timestamp, so a flat mean equals the mean of per-exchange rates; no
+    # wide pivot table is needed, whether one exchange or several)
+    avg_rate = df.groupby("funding_time", sort=True)["funding_rate"].mean()
 
-    # Apply rolling average
-    rolling_avg = avg_rate.rolling(window=window_periods, min_periods=1).mean()
+    # Apply rolling average (a 1-period window is the series itself)
+    if window_periods > 1:
+        rolling_avg = avg_rate.rolling(window=window_periods, min_periods=1).mean()
+    else:
+        rolling_avg = avg_rate
 
-    # Calculate annualized rate: rate * 3 (per day) * 365 (per year) * 100 (percentage)
-    annualized = rolling_avg * 3 * 365 * 100
+    annualized = rolling_avg * ANNUALIZATION_FACTOR
 
     result = pd.DataFrame({
         "funding_time": rolling_avg.index,
         "annualized_rate": annualized.values,
     }).reset_index(drop=True)
 
-    # Downsample if too many points
+    # Downsample if too many points, averaging the rates in each bucket
     max_points = 100
     if len(result) > max_points:
-        step = len(result) // max_points
-        result = result.iloc[::step].reset_index(drop=True)
+        result = _downsample(result, "funding_time", max_points, {"annualized_rate": "mean"})
 
     return result
 
@@ -391,31 +424,24 @@ def create_funding_plot(
         return ""
 
     # Prepare data
-    x_indices = list(range(len(df)))
-    rates = df["annualized_rate"].tolist()
+    rates = df["annualized_rate"].to_numpy(dtype=float)
+    x_indices = np.arange(len(rates))
 
-    # Create date labels for x-axis ticks
-    date_labels = [dt.strftime("%d/%m %H:%M") for dt in df["funding_time"]]
-    num_ticks = min(10, len(x_indices))
-    tick_step = max(1, len(x_indices) // num_ticks)
-    tick_indices = x_indices[::tick_step]
-    tick_labels = date_labels[::tick_step]
+    # Date labels for the x-axis ticks
+    tick_indices, tick_labels = _time_ticks(df["funding_time"])
 
     # Create plot
-    plt.clf()
-    plt.clear_figure()
-    plt.clear_data()
-    plt.clear_color()
+    plt.clear_figure()  # also resets data, colors and theme
     plt.theme("dark")
     plt.plotsize(width, height)
     plt.title(title)
 
     # Plot as dots - color based on positive/negative
     # Split into positive and negative for different colors
-    pos_x = [x for x, r in zip(x_indices, rates) if r >= 0]
-    pos_y = [r for r in rates if r >= 0]
-    neg_x = [x for x, r in zip(x_indices, rates) if r < 0]
-    neg_y = [r for r in rates if r < 0]
+    pos = rates >= 0
+    neg = rates < 0
+    pos_x, pos_y = x_indices[pos].tolist(), rates[pos].tolist()
+    neg_x, neg_y = x_indices[neg].tolist(), rates[neg].tolist()
 
     if pos_x:
         plt.scatter(pos_x, pos_y, label="Positive", color="green", marker="dot")
@@ -426,7 +452,7 @@ def create_funding_plot(
     plt.hline(0, color="white")
 
     # Format y-axis
-    rate_min, rate_max = min(rates), max(rates)
+    rate_min, rate_max = float(rates.min()), float(rates.max())
     rate_range = rate_max - rate_min
     if rate_range > 0:
         rate_ticks = [rate_min + i * rate_range / 5 for i in range(6)]
@@ -441,21 +467,21 @@ def create_funding_plot(
 
 
 def display_funding_plot(
-    funding_rates: list[FundingRateModel],
+    funding_rates: list[FundingRateModel] | pd.DataFrame,
     console: Console | None = None,
     symbol: str = "",
 ) -> None:
     """Display funding rate dot plot.
 
     Args:
-        funding_rates: List of FundingRateModel objects
+        funding_rates: List of FundingRateModel objects, or their DataFrame
         console: Rich Console instance (creates new if None)
         symbol: Symbol for title
     """
     if console is None:
         console = Console()
 
-    if not funding_rates:
+    if funding_rates is None or len(funding_rates) == 0:
         console.print("[yellow]No funding data available for plotting[/yellow]")
         return
 
@@ -1,11 +1,16 @@
 """Terminal output using rich tables."""
 
+import math
+from collections import defaultdict
+from operator import attrgetter
+
+import numpy as np
 import pandas as pd
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 
-from src.analysis.calculator import AnalysisResult, calculate_aggregated_deltas
+from src.analysis.calculator import AnalysisResult, TimeframeDelta, calculate_aggregated_deltas
 from src.output.plots import display_price_volume_plot
 
 
@@ -18,34 +23,39 @@ def display_analysis(result: AnalysisResult) -> None:
     Args:
         result: AnalysisResult from calculator
     """
-    # Header
-    console.print()
-    console.print(Panel(
-        f"[bold cyan]{result.symbol}[/bold cyan] Analysis: "
-        f"{result.start_time.strftime('%Y-%m-%d %H:%M')} to "
-        f"{result.end_time.strftime('%Y-%m-%d %H:%M')}",
-        title="Liquidity Analysis",
-        border_style="cyan",
-    ))
-
-    if not result.exchange_analyses:
-        console.print("[yellow]No data available for analysis[/yellow]")
-        return
-
-    # Display each exchange analysis
-    for analysis in result.exchange_analyses:
-        _display_exchange_analysis(analysis)
-
-    # Display aggregated analysis (after individual exchanges)
-    market_types = set(a.market_type for a in result.exchange_analyses)
-    for market_type in sorted(market_types):
-        # Only show aggregate if more than 1 exchange has data for this type
-        exchanges_with_type = [a for a in result.exchange_analyses if a.market_type == market_type]
-        if len(exchanges_with_type) > 1:
-            _display_aggregated_analysis(result.exchange_analyses, market_type)
-
-    # Display raw data summary
-    _display_raw_data_summary(result)
+    # Everything up to the plot is rendered into the console's buffer and
+    # written to the terminal in one go when the block exits
+    with console:
+        # Header
+        console.print()
+        console.print(Panel(
+            f"[bold cyan]{result.symbol}[/bold cyan] Analysis: "
+            f"{result.start_time.strftime('%Y-%m-%d %H:%M')} to "
+            f"{result.end_time.strftime('%Y-%m-%d %H:%M')}",
+            title="Liquidity Analysis",
+            border_style="cyan",
+        ))
+
+        if not result.exchange_analyses:
+            console.print("[yellow]No data available for analysis[/yellow]")
+            return
+
+        # Display each exchange analysis
+        for analysis in result.exchange_analyses:
+            _display_exchange_analysis(analysis)
+
+        # Display aggregated analysis (after individual exchanges)
+        by_market_type = defaultdict(list)
+        for analysis in result.exchange_analyses:
+            by_market_type[analysis.market_type].append(analysis)
+        for market_type in sorted(by_market_type):
+            # Only show aggregate if more than 1 exchange has data for this type
+            exchanges_with_type = by_market_type[market_type]
+            if len(exchanges_with_type) > 1:
+                _display_aggregated_analysis(exchanges_with_type, market_type)
+
+        # Display raw data summary
+        _display_raw_data_summary(result)
 
     # Display price/volume time series plot
     display_price_volume_plot(result, console)
@@ -61,48 +71,7 @@ def _display_exchange_analysis(analysis) -> None:
     console.print()
     console.print(f"[bold green]{title}[/bold green]")
 
-    # Create delta table
-    table = Table(show_header=True, header_style="bold magenta")
-    table.add_column("Metric", style="cyan")
-
-    # Add timeframe columns
-    for delta in analysis.timeframe_deltas:
-        table.add_column(f"{delta.timeframe} Δ", justify="right")
-
-    # Price row
-    price_cells = []
-    for delta in analysis.timeframe_deltas:
-        sign = "+" if delta.price_delta_pct >= 0 else ""
-        color = "green" if delta.price_delta_pct >= 0 else "red"
-        price_cells.append(f"[{color}]{sign}{delta.price_delta_pct:.2f}%[/{color}]")
-    table.add_row("Price", *price_cells)
-
-    # Volume row
-    volume_cells = []
-    for delta in analysis.timeframe_deltas:
-        volume_cells.append(_format_number(delta.volume_total))
-    table.add_row("Volume", *volume_cells)
-
-    # OI row (if available)
-    oi_cells = []
-    has_oi = any(d.oi_delta is not None for d in analysis.timeframe_deltas)
-    if has_oi:
-        for delta in analysis.timeframe_deltas:
-            if delta.oi_delta is not None:
-                sign = "+" if delta.oi_delta >= 0 else ""
-                color = "green" if delta.oi_delta >= 0 else "red"
-                oi_cells.append(f"[{color}]{sign}{_format_number(delta.oi_delta)}[/{color}]")
-            else:
-                oi_cells.append("-")
-        table.add_row("OI", *oi_cells)
-
-    # VWAP row
-    vwap_cells = []
-    for delta in analysis.timeframe_deltas:
-        vwap_cells.append(f"${delta.vwap:.6f}")
-    table.add_row("VWAP", *vwap_cells)
-
-    console.print(table)
+    console.print(_delta_table(analysis.timeframe_deltas, "Price"))
 
 
 def _display_aggregated_analysis(
@@ -112,7 +81,7 @@ def _display_aggregated_analysis(
     """Display aggregated analysis across all exchanges for a market type.
 
     Args:
-        exchange_analyses: List of ExchangeAnalysis objects
+        exchange_analyses: ExchangeAnalysis objects of this market type
         market_type: Market type to aggregate
     """
     agg_deltas = calculate_aggregated_deltas(exchange_analyses, market_type)
@@ -123,42 +92,63 @@ def _display_aggregated_analysis(
     console.print()
     console.print(f"[bold magenta]{title}[/bold magenta]")
 
+    console.print(_delta_table(agg_deltas, "Price (VWAP)"))
+
+
+# Days listed in the raw data summary before the middle ones are elided
+RAW_SUMMARY_MAX_DAYS = 14
+
+
+# (sign, color) for a delta, indexed by `delta >= 0`
+_SIGN_COLOR = (("", "red"), ("+", "green"))
+
+
+def _signed_cell(value: float, text: str) -> str:
+    """Color a delta cell green with a + sign when non-negative, else red.
+
+    Args:
+        value: Delta deciding sign and color
+        text: Formatted delta
+
+    Returns:
+        Rich markup for the cell
+    """
+    sign, color = _SIGN_COLOR[bool(value >= 0)]  # value may be a NumPy float
+    return f"[{color}]{sign}{text}[/{color}]"
+
+
+# Fields of a TimeframeDelta shown by _delta_table, in unpacking order
+_delta_metrics = attrgetter("timeframe", "price_delta_pct", "volume_total", "oi_delta", "vwap")
+
+
+def _delta_table(deltas: list[TimeframeDelta], price_label: str) -> Table:
+    """Build the Metric x timeframe table for a list of timeframe deltas.
+
+    Args:
+        deltas: TimeframeDelta objects, one column each
+        price_label: Label of the price row
+
+    Returns:
+        Table with price, volume, OI (when any) and VWAP rows
+    """
+    # One column per metric, read off the deltas in a single pass
+    timeframes, price_pcts, volumes, oi_deltas, vwaps = (
+        zip(*map(_delta_metrics, deltas)) if deltas else ((),) * 5
+    )
+
     table = Table(show_header=True, header_style="bold magenta")
     table.add_column("Metric", style="cyan")
+    for timeframe in timeframes:
+        table.add_column(f"{timeframe} Δ", justify="right")
 
-    for delta in agg_deltas:
-        table.add_column(f"{delta.timeframe} Δ", justify="right")
-
-    # Price row (volume-weighted)
-    price_cells = []
-    for delta in agg_deltas:
-        sign = "+" if delta.price_delta_pct >= 0 else ""
-        color = "green" if delta.price_delta_pct >= 0 else "red"
-        price_cells.append(f"[{color}]{sign}{delta.price_delta_pct:.2f}%[/{color}]")
-    table.add_row("Price (VWAP)", *price_cells)
-
-    # Volume row (total)
-    volume_cells = [_format_number(d.volume_total) for d in agg_deltas]
-    table.add_row("Volume", *volume_cells)
-
-    # OI row (total)
-    has_oi = any(d.oi_delta is not None for d in agg_deltas)
-    if has_oi:
-        oi_cells = []
-        for delta in agg_deltas:
-            if delta.oi_delta is not None:
-                sign = "+" if delta.oi_delta >= 0 else ""
-                color = "green" if delta.oi_delta >= 0 else "red"
-                oi_cells.append(f"[{color}]{sign}{_format_number(delta.oi_delta)}[/{color}]")
-            else:
-                oi_cells.append("-")
-        table.add_row("OI", *oi_cells)
-
-    # VWAP row
-    vwap_cells = [f"${d.vwap:.6f}" for d in agg_deltas]
-    table.add_row("VWAP", *vwap_cells)
-
-    console.print(table)
+    table.add_row(price_label, *[_signed_cell(pct, f"{pct:.2f}%") for pct in price_pcts])
+    table.add_row("Volume", *map(_format_number, volumes))
+    if any(oi is not None for oi in oi_deltas):
+        table.add_row("OI", *[
+            _signed_cell(oi, _format_number(oi)) if oi is not None else "-" for oi in oi_deltas
+        ])
+    table.add_row("VWAP", *[f"${vwap:.6f}" for vwap in vwaps])
+    return table
 
 
 def _display_raw_data_summary(result: AnalysisResult) -> None:
@@ -173,15 +163,26 @@ def _display_raw_data_summary(result: AnalysisResult) -> None:
     console.print()
     console.print("[bold yellow]RAW DATA (daily)[/bold yellow]")
 
-    df = result.raw_klines.copy()
-    df["date"] = df["open_time"].dt.date
-
-    # Calculate typical price and VWAP components
-    df["typical_price"] = (df["high"] + df["low"] + df["close"]) / 3
-    df["tp_volume"] = df["typical_price"] * df["volume"]
+    # Typical price * volume per candle (VWAP component), in place in one
+    # buffer; only the columns the aggregation needs are carried along
+    klines = result.raw_klines
+    volume = klines["volume"].to_numpy()
+    tp_volume = np.add(klines["high"].to_numpy(), klines["low"].to_numpy())
+    np.add(tp_volume, klines["close"].to_numpy(), out=tp_volume)
+    np.divide(tp_volume, 3, out=tp_volume)
+    np.multiply(tp_volume, volume, out=tp_volume)
+    # Group keys are integer coded: midnight timestamps and categoricals
+    df = pd.DataFrame({
+        "date": klines["open_time"].dt.normalize(),
+        "exchange": klines["exchange"].astype("category"),
+        "market_type": klines["market_type"].astype("category"),
+        "volume": volume,
+        "quote_volume": klines["quote_volume"],
+        "tp_volume": tp_volume,
+    }, copy=False)
 
     # Aggregate by date, exchange, market_type
-    daily = df.groupby(["date", "exchange", "market_type"]).agg({
+    daily = df.groupby(["date", "exchange", "market_type"], observed=True).agg({
         "volume": "sum",           # Total daily volume (tokens)
         "quote_volume": "sum",     # Total daily volume (USD)
         "tp_volume": "sum",        # Sum of typical_price * volume for VWAP
@@ -192,13 +193,17 @@ def _display_raw_data_summary(result: AnalysisResult) -> None:
     daily = daily.sort_values("date")
 
     # Get OI data by date and exchange
-    oi_df = result.raw_oi.copy()
-    if not oi_df.empty:
-        oi_df["date"] = oi_df["timestamp"].dt.date
-        oi_daily = oi_df.groupby(["date", "exchange"]).agg({
-            "open_interest": "last"  # End of day OI per exchange
-        }).reset_index()
-        daily = daily.merge(oi_daily, on=["date", "exchange"], how="left")
+    if result.raw_oi is not None:
+        oi_df = pd.DataFrame({
+            "date": result.raw_oi["timestamp"].dt.normalize(),
+            "exchange": result.raw_oi["exchange"].astype("category"),
+            "open_interest": result.raw_oi["open_interest"],
+        }, copy=False)
+        # End of day OI per exchange, looked up by (date, exchange) index
+        oi_daily = oi_df.groupby(
+            ["date", "exchange"], sort=False, observed=True
+        )["open_interest"].last()
+        daily = daily.join(oi_daily, on=["date", "exchange"])
     else:
         daily["open_interest"] = None
 
@@ -212,22 +217,43 @@ def _display_raw_data_summary(result: AnalysisResult) -> None:
     table.add_column("Volume USD", justify="right")
     table.add_column("OI", justify="right")
 
-    # Iterate by date and add totals for each day
+    # Like pandas' display.max_rows, long ranges show only the first and last
+    # days; the days in between are never formatted
     dates = daily["date"].unique()
-    for date in dates:
-        day_rows = daily[daily["date"] == date]
+    head_days = RAW_SUMMARY_MAX_DAYS // 2
+    if len(dates) > RAW_SUMMARY_MAX_DAYS:
+        tail_days = RAW_SUMMARY_MAX_DAYS - head_days
+        shown_dates = np.concatenate([dates[:head_days], dates[-tail_days:]])
+        shown = daily[daily["date"].isin(shown_dates)]
+    else:
+        shown = daily
+    hidden_days = len(dates) - shown["date"].nunique()
+
+    # Format every exchange row's cells up front, column by column
+    open_interest = shown["open_interest"].to_numpy(dtype=float)
+    shown = shown.assign(
+        date_str=shown["date"].dt.strftime("%Y-%m-%d"),
+        vwap_str=np.char.mod("$%.6f", shown["vwap"].to_numpy(dtype=float)),
+        volume_str=_format_numbers(shown["volume"].to_numpy(dtype=float)),
+        quote_str=_format_numbers(shown["quote_volume"].to_numpy(dtype=float)),
+        oi_str=np.where(np.isnan(open_interest), "-", _format_numbers(open_interest)),
+    )
 
+    # Iterate by date (one pass over the sorted rows) and add totals for each day
+    add_row = table.add_row
+    for day, (date, day_rows) in enumerate(shown.groupby("date", sort=True)):
+        if hidden_days and day == head_days:
+            add_row(*["..."] * len(table.columns))
         # Display each exchange row for this day
         for row in day_rows.itertuples():
-            oi_str = _format_number(row.open_interest) if pd.notna(row.open_interest) else "-"
-            table.add_row(
-                str(row.date),
+            add_row(
+                row.date_str,
                 row.exchange,
                 row.market_type,
-                f"${row.vwap:.6f}",
-                _format_number(row.volume),
-                _format_number(row.quote_volume),
-                oi_str,
+                row.vwap_str,
+                row.volume_str,
+                row.quote_str,
+                row.oi_str,
             )
 
         # Add daily total row
@@ -237,8 +263,8 @@ def _display_raw_data_summary(result: AnalysisResult) -> None:
         total_vwap = total_tp_volume / total_volume if total_volume > 0 else 0
         total_oi = day_rows["open_interest"].dropna().sum()
         total_oi_str = f"[bold yellow]{_format_number(total_oi)}[/bold yellow]" if total_oi > 0 else "-"
-        table.add_row(
-            str(date),
+        add_row(
+            f"{date:%Y-%m-%d}",
             "[bold yellow]TOTAL[/bold yellow]",
             "-",
             f"[bold yellow]${total_vwap:.6f}[/bold yellow]",
@@ -263,6 +289,10 @@ def _display_raw_data_summary(result: AnalysisResult) -> None:
         console.print(f"  Latest OI:        {_format_number(latest_oi)}")
 
 
+# (threshold and divisor, suffix) for _format_number, largest first
+_SCALES = ((1_000_000_000.0, "B"), (1_000_000.0, "M"), (1_000.0, "K"))
+
+
 def _format_number(value: float) -> str:
     """Format large numbers with K/M/B suffixes.
 
@@ -272,15 +302,27 @@ def _format_number(value: float) -> str:
     Returns:
         Formatted string
     """
-    abs_value = abs(value)
-    if abs_value >= 1_000_000_000:
-        return f"{value / 1_000_000_000:.2f}B"
-    elif abs_value >= 1_000_000:
-        return f"{value / 1_000_000:.2f}M"
-    elif abs_value >= 1_000:
-        return f"{value / 1_000:.2f}K"
-    else:
-        return f"{value:.2f}"
+    abs_value = math.fabs(value)
+    for scale, suffix in _SCALES:
+        if abs_value >= scale:
+            return f"{value / scale:.2f}{suffix}"
+    return f"{value:.2f}"
+
+
+def _format_numbers(values: np.ndarray) -> np.ndarray:
+    """Vectorized _format_number over an array of floats.
+
+    Args:
+        values: Numbers to format
+
+    Returns:
+        Array of formatted strings
+    """
+    abs_values = np.abs(values)
+    thresholds = [abs_values >= scale for scale, _ in _SCALES]
+    scale = np.select(thresholds, [scale for scale, _ in _SCALES], 1.0)
+    suffix = np.select(thresholds, [suffix for _, suffix in _SCALES], "")
+    return np.char.add(np.char.mod("%.2f", values / scale), suffix)
 
 
 def display_data_summary(
@@ -311,25 +353,30 @@ def display_data_summary(
         border_style="green",
     ))
 
-    console.print(f"  Klines stored: [cyan]{kline_count:,}[/cyan]")
-    console.print(f"  OI snapshots: [cyan]{oi_count:,}[/cyan]")
-    console.print(f"  Funding rates: [cyan]{funding_count:,}[/cyan]")
+    # Plain text lines are collected and printed in one go
+    lines = [
+        f"  Klines stored: [cyan]{kline_count:,}[/cyan]",
+        f"  OI snapshots: [cyan]{oi_count:,}[/cyan]",
+        f"  Funding rates: [cyan]{funding_count:,}[/cyan]",
+    ]
 
     if earliest and latest:
-        console.print(f"  Date range: [yellow]{earliest}[/yellow] to [yellow]{latest}[/yellow]")
+        lines.append(f"  Date range: [yellow]{earliest}[/yellow] to [yellow]{latest}[/yellow]")
 
     exchange_str = "  ".join(
         f"[green]{ex} ✓[/green]" if avail else f"[red]{ex} ✗[/red]"
         for ex, avail in exchanges.items()
     )
-    console.print(f"  Exchanges: {exchange_str}")
+    lines.append(f"  Exchanges: {exchange_str}")
 
     # Show per-exchange date ranges if available
     if exchange_date_ranges:
-        console.print()
-        console.print("  [dim]Per-exchange data availability:[/dim]")
+        lines.append("")
+        lines.append("  [dim]Per-exchange data availability:[/dim]")
         for ex, (ex_earliest, ex_latest) in sorted(exchange_date_ranges.items()):
-            console.print(f"    {ex}: [dim]{ex_earliest}[/dim] to [dim]{ex_latest}[/dim]")
+            lines.append(f"    {ex}: [dim]{ex_earliest}[/dim] to [dim]{ex_latest}[/dim]")
+
+    console.print("\n".join(lines))
 
 
 def display_funding_stats(funding_stats: dict) -> None:
@@ -344,6 +391,8 @@ def display_funding_stats(funding_stats: dict) -> None:
         border_style="cyan",
     ))
 
+    # Text lines above the table are collected and printed in one go
+    lines = []
     avg_rate = funding_stats.get("avg_rate")
     annualized = funding_stats.get("annualized_rate")
 
@@ -353,21 +402,23 @@ def display_funding_stats(funding_stats: dict) -> None:
         color = "green" if avg_rate >= 0 else "red"
         sign = "+" if avg_rate >= 0 else ""
 
-        console.print(f"  Avg Funding (full range): [{color}]{sign}{rate_pct:.4f}%[/{color}]")
+        lines.append(f"  Avg Funding (full range): [{color}]{sign}{rate_pct:.4f}%[/{color}]")
 
         if annualized is not None:
             ann_color = "green" if annualized >= 0 else "red"
             ann_sign = "+" if annualized >= 0 else ""
-            console.print(f"  Annualized Rate:          [{ann_color}]{ann_sign}{annualized:.2f}%[/{ann_color}]")
+            lines.append(f"  Annualized Rate:          [{ann_color}]{ann_sign}{annualized:.2f}%[/{ann_color}]")
     else:
-        console.print("  [dim]No funding data available[/dim]")
+        lines.append("  [dim]No funding data available[/dim]")
 
     # Per-exchange breakdown
     per_exchange = funding_stats.get("per_exchange", {})
     if per_exchange:
-        console.print()
-        console.print("  [dim]Latest per exchange:[/dim]")
+        lines.append("")
+        lines.append("  [dim]Latest per exchange:[/dim]")
+    console.print("\n".join(lines))
 
+    if per_exchange:
         table = Table(show_header=True, header_style="bold", box=None, padding=(0, 2))
         table.add_column("Exchange", style="dim")
         table.add_column("Rate", justify="right")
@@ -0,0 +1,41 @@
+"""Shared fixtures."""
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.connectors.base import Kline, MarketType
+from src.db import Repository, init_db
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    """Async engine on an empty SQLite file."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def repo(engine):
+    """Repository on a freshly initialized database."""
+    await init_db(engine)
+    return Repository(async_sessionmaker(engine, expire_on_commit=False))
+
+
+def make_kline(hour: int, close: float = 1.0) -> Kline:
+    """Build a 1h Binance spot candle at the given hour of 2024-01-01."""
+    return Kline(
+        exchange="binance",
+        market_type=MarketType.SPOT,
+        symbol="COAIUSDT",
+        interval="1h",
+        open_time=datetime(2024, 1, 1, hour, tzinfo=timezone.utc),
+        open=1.0,
+        high=2.0,
+        low=0.5,
+        close=close,
+        volume=10.0,
+        quote_volume=15.0,
+    )
@@ -0,0 +1,93 @@
+"""Tests for database initialization and legacy schema migration."""
+
+import sqlite3
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+
+from src.db import init_db
+from src.db.models import to_ms
+
+LEGACY_SCHEMA = """
+CREATE TABLE klines (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    exchange VARCHAR(20), market_type VARCHAR(10), symbol VARCHAR(20),
+    interval VARCHAR(5), open_time DATETIME,
+    open FLOAT, high FLOAT, low FLOAT, close FLOAT, volume FLOAT, quote_volume FLOAT
+);
+CREATE TABLE open_interest (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    exchange VARCHAR(20), symbol VARCHAR(20), timestamp DATETIME,
+    open_interest FLOAT, open_interest_value FLOAT
+);
+CREATE TABLE funding_rates (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    exchange VARCHAR(20), symbol VARCHAR(20), funding_time DATETIME, funding_rate FLOAT
+);
+"""
+
+STAMP = "2024-01-02 03:04:05.678000"
+STAMP_MS = to_ms(datetime(2024, 1, 2, 3, 4, 5, 678000, tzinfo=timezone.utc))
+
+
+def _write_legacy_db(path) -> None:
+    """Create a database in the schema with id keys and DATETIME text."""
+    with sqlite3.connect(path) as conn:
+        conn.executescript(LEGACY_SCHEMA)
+        conn.execute(
+            "INSERT INTO klines (exchange, market_type, symbol, interval, open_time,"
+            " open, high, low, close, volume, quote_volume)"
+            " VALUES ('binance', 'spot', 'COAIUSDT', '1h', ?, 1, 2, 0.5, 1.5, 10, 15)",
+            (STAMP,),
+        )
+        conn.execute(
+            "INSERT INTO open_interest (exchange, symbol, timestamp, open_interest,"
+            " open_interest_value) VALUES ('binance', 'COAIUSDT', ?, 100, 150)",
+            (STAMP,),
+        )
+        conn.execute(
+            "INSERT INTO funding_rates (exchange, symbol, funding_time, funding_rate)"
+            " VALUES ('binance', 'COAIUSDT', ?, 0.0001)",
+            (STAMP,),
+        )
+    conn.close()
+
+
+async def test_legacy_tables_migrate_to_epoch_ms_without_rowid(tmp_path, engine):
+    _write_legacy_db(tmp_path / "test.db")
+
+    await init_db(engine)
+
+    async with engine.connect() as conn:
+        for table, column in [
+            ("klines", "open_time"),
+            ("open_interest", "timestamp"),
+            ("funding_rates", "funding_time"),
+        ]:
+            columns = {row[1] for row in await conn.execute(text(f"PRAGMA table_info({table})"))}
+            assert "id" not in columns
+            sql = (await conn.execute(
+                text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": table},
+            )).scalar_one()
+            assert "WITHOUT ROWID" in sql
+            rows = (await conn.execute(
+                text(f"SELECT {column}, typeof({column}) FROM {table}")
+            )).all()
+            assert rows == [(STAMP_MS, "integer")]
+
+        legacy = (await conn.execute(
+            text("SELECT name FROM sqlite_master WHERE name LIKE '%_legacy'")
+        )).all()
+        assert legacy == []
+
+
+async def test_init_db_is_idempotent(tmp_path, engine):
+    _write_legacy_db(tmp_path / "test.db")
+
+    await init_db(engine)
+    await init_db(engine)
+
+    async with engine.connect() as conn:
+        rows = (await conn.execute(text("SELECT open_time FROM klines"))).all()
+    assert rows == [(STAMP_MS,)]
@@ -0,0 +1,43 @@
+"""Tests for the fetch-and-store pipeline."""
+
+import pytest
+
+import src.main as main
+from src.connectors.base import KlineBatch
+from tests.conftest import make_kline
+
+
+async def test_store_stream_keeps_written_blocks_on_fetch_error(repo, monkeypatch):
+    monkeypatch.setattr(main, "FLUSH_ROWS", 2)
+
+    async def batches():
+        for hour in range(0, 6, 2):
+            yield KlineBatch.from_klines([make_kline(hour), make_kline(hour + 1)])
+        raise RuntimeError("connection reset")
+
+    with pytest.raises(RuntimeError, match="connection reset"):
+        await main._store_stream(
+            batches(),
+            lambda pending: repo.upsert_kline_batch(KlineBatch.concat(pending)),
+            queue_size=1,
+            size=len,
+        )
+
+    summary = await repo.get_symbol_summary("COAIUSDT")
+    assert summary.kline_count == 6
+
+
+async def test_store_stream_writes_the_tail(repo):
+    async def batches():
+        yield KlineBatch.from_klines([make_kline(0), make_kline(1)])
+
+    fetched = await main._store_stream(
+        batches(),
+        lambda pending: repo.upsert_kline_batch(KlineBatch.concat(pending)),
+        queue_size=4,
+        size=len,
+    )
+
+    assert fetched == 2
+    summary = await repo.get_symbol_summary("COAIUSDT")
+    assert summary.kline_count == 2
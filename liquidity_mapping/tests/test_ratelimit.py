@@ -0,0 +1,70 @@
+"""Tests for request rate limiting."""
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from src.connectors import ratelimit
+from src.connectors.ratelimit import TokenBucket, retry_delay
+
+
+class FakeClock:
+    """Stand-in for time.monotonic and asyncio.sleep that only moves when slept on."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Drive the rate limiter from a fake clock instead of wall time."""
+    clock = FakeClock()
+    monkeypatch.setattr(ratelimit, "time", clock)
+    monkeypatch.setattr(ratelimit, "asyncio", SimpleNamespace(Lock=asyncio.Lock, sleep=clock.sleep))
+    return clock
+
+
+async def test_token_bucket_bursts_then_paces(clock):
+    # Powers of two keep the fake clock's float arithmetic exact
+    bucket = TokenBucket(rate=16, capacity=2)
+    start = clock.now
+
+    for _ in range(2):
+        await bucket.acquire()
+    assert clock.now == start
+
+    for _ in range(4):
+        async with bucket:
+            pass
+    # Four tokens beyond the burst at 16 per second
+    assert clock.now - start == 0.25
+    assert clock.sleeps == [1 / 16] * 4
+
+
+async def test_token_bucket_pause_holds_back_requests(clock):
+    bucket = TokenBucket(rate=128)
+    bucket.pause(0.25)
+
+    start = clock.now
+    await bucket.acquire()
+    assert clock.now - start == 0.25
+
+
+def test_retry_delay_uses_retry_after():
+    assert retry_delay(0, httpx.Headers({"Retry-After": "3"})) == 3.0
+    assert retry_delay(0, httpx.Headers({"Retry-After": "120"}), cap=30.0) == 30.0
+
+
+def test_retry_delay_backoff_is_capped():
+    for attempt in range(10):
+        assert 0 <= retry_delay(attempt, cap=4.0) <= 4.0
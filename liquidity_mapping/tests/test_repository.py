@@ -0,0 +1,24 @@
+"""Tests for the repository upserts."""
+
+from tests.conftest import make_kline
+
+
+async def test_identical_upsert_changes_nothing(repo):
+    klines = [make_kline(hour) for hour in range(3)]
+
+    assert await repo.upsert_klines(klines) == 3
+    # The IS NOT excluded guard skips rows whose values are unchanged
+    assert await repo.upsert_klines(klines) == 0
+
+    summary = await repo.get_symbol_summary("COAIUSDT")
+    assert summary.kline_count == 3
+
+
+async def test_changed_upsert_updates_only_changed_rows(repo):
+    await repo.upsert_klines([make_kline(hour) for hour in range(3)])
+
+    updated = [make_kline(0), make_kline(1, close=1.25), make_kline(2)]
+    assert await repo.upsert_klines(updated) == 1
+
+    klines = await repo.get_klines("COAIUSDT", "1h")
+    assert [k.close for k in klines] == [1.0, 1.25, 1.0]